@@ -1,10 +1,12 @@
-import uuid
+import os
 import re
-from typing import Dict, Any, List, Tuple, Optional, Union
+from typing import Dict, Any, Callable, Iterator, List, Mapping, Tuple, Type, TypeVar, Optional, Union
 import json
 from pathlib import Path
 import fnmatch
 from functools import lru_cache
+import threading
+from types import MappingProxyType
 from models import (
     Dashboard,
     MetricConfig,
@@ -13,24 +15,80 @@ from models import (
     LayoutItem,
     DashboardMeta,
 )
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Which model each overridable field belongs to, derived from the models once at import
+# (metricCode/asset and name are set explicitly by build_metric_config)
+_META_FIELDS = tuple(field for field in MetricMeta.model_fields if field not in ("metricCode", "asset"))
+_EXTRA_FIELDS = tuple(field for field in MetricExtra.model_fields if field != "name")
+_FIELD_BUCKET = {**dict.fromkeys(_META_FIELDS, "meta"), **dict.fromkeys(_EXTRA_FIELDS, "extra")}
+
+# Splits CamelCase on uppercase letters that do not follow another uppercase letter
+_CAMEL_SPLIT_RE = re.compile(r"(?<!^)(?<![A-Z])(?=[A-Z])")
+
+# Layout items and the dashboard wrapper only hold values produced by this module and already validated
+# configs, so they are built with model_construct, skipping pydantic validation. Metric fields come from
+# user specs and are always validated. Set to False to validate the generated models as well.
+_FAST_CONSTRUCT = True
+
+# Characters that make a defaults key a glob pattern rather than an exact metric code
+_GLOB_CHARS = frozenset("*?[")
+
+# Pattern defaults split into exact keys and globs; each entry keeps its position in the file
+_PatternDefaults = Tuple[Dict[str, Tuple[int, Dict]], List[Tuple[int, re.Pattern, Dict]]]
+
+
+def _compile_patterns(pattern_defaults: Dict[str, Dict]) -> _PatternDefaults:
+    """
+    Partition pattern keys into exact metric codes and compiled globs.
+    Positions are kept so matches can still be applied in file order.
+    """
+    exact = {}
+    globs = []
+    for index, (pattern, values) in enumerate(pattern_defaults.items()):
+        if _GLOB_CHARS.isdisjoint(pattern):
+            exact[pattern] = (index, values)
+        else:
+            globs.append((index, re.compile(fnmatch.translate(pattern)), values))
+    return exact, globs
+
+
+def _apply_patterns(defaults: Dict[str, Any], patterns: _PatternDefaults, metric_code: str) -> None:
+    """Update defaults with every pattern matching metric_code, in file order."""
+    exact, globs = patterns
+    matched = [(index, values) for index, pattern, values in globs if pattern.match(metric_code)]
+
+    exact_match = exact.get(metric_code)
+    if exact_match is not None:
+        matched.append(exact_match)
+        matched.sort(key=lambda match: match[0])
+
+    for _, values in matched:
+        defaults.update(values)
 
 
 @lru_cache(maxsize=1)
-def _load_defaults() -> Tuple[Dict, Dict, Dict]:
-    """Load default configurations from JSON files. Cached for performance."""
+def _load_defaults() -> Tuple[Dict, _PatternDefaults, Dict[str, _PatternDefaults]]:
+    """
+    Load default configurations from JSON files. Cached for performance.
+    Metric and override pattern keys are partitioned and compiled once here so lookups
+    don't re-translate globs and exact metric codes are a dict lookup.
+    """
     defaults_dir = Path(__file__).parent / "defaults"
 
-    # Load asset defaults
-    with open(defaults_dir / "assets.json") as f:
-        asset_defaults = json.load(f)
+    # Load asset defaults (files are read as bytes, json.loads detects the encoding)
+    asset_defaults = json.loads((defaults_dir / "assets.json").read_bytes())
 
     # Load metric defaults
-    with open(defaults_dir / "metrics.json") as f:
-        metric_defaults = json.load(f)
+    metric_defaults = _compile_patterns(json.loads((defaults_dir / "metrics.json").read_bytes()))
 
     # Load overrides
-    with open(defaults_dir / "overrides.json") as f:
-        overrides = json.load(f)
+    overrides = {
+        asset: _compile_patterns(patterns)
+        for asset, patterns in json.loads((defaults_dir / "overrides.json").read_bytes()).items()
+    }
 
     return asset_defaults, metric_defaults, overrides
 
@@ -50,54 +108,94 @@ def _get_defaults_for_metric(metric_code: str, asset: str) -> Dict[str, Any]:
         defaults.update(asset_defaults[asset])
 
     # 2. Apply metric defaults (exact match or pattern)
-    for pattern, values in metric_defaults.items():
-        if pattern == metric_code or fnmatch.fnmatch(metric_code, pattern):
-            defaults.update(values)
+    _apply_patterns(defaults, metric_defaults, metric_code)
 
     # 3. Apply asset-metric overrides
     if asset in overrides:
-        for pattern, values in overrides[asset].items():
-            if pattern == metric_code or fnmatch.fnmatch(metric_code, pattern):
-                defaults.update(values)
+        _apply_patterns(defaults, overrides[asset], metric_code)
 
     return defaults
 
 
+@lru_cache(maxsize=1024)
+def _get_routed_defaults(metric_code: str, asset: str) -> Tuple[Mapping[str, Any], Mapping[str, Any]]:
+    """
+    Defaults for a metric-asset combination, already split into meta and extra fields.
+    The meta part includes metricCode and asset, so a call without overrides only has to copy both.
+    Cached per (metric_code, asset); the results are read-only since they are shared between callers.
+    """
+    meta_defaults = {"metricCode": metric_code, "asset": asset}
+    extra_defaults = {}
+    kwargs_by_bucket = {"meta": meta_defaults, "extra": extra_defaults}
+
+    # Route each field to meta or extra; keys that belong to neither model are dropped
+    for field, value in _get_defaults_for_metric(metric_code, asset).items():
+        bucket = _FIELD_BUCKET.get(field)
+        if bucket is not None:
+            kwargs_by_bucket[bucket][field] = value
 
+    return MappingProxyType(meta_defaults), MappingProxyType(extra_defaults)
 
 
+def _construct(model_cls: Type[ModelT], **fields: Any) -> ModelT:
+    """Instantiate a model holding only generated values, skipping validation when _FAST_CONSTRUCT is enabled."""
+    if _FAST_CONSTRUCT:
+        return model_cls.model_construct(**fields)
+    return model_cls(**fields)
+
+
+@lru_cache(maxsize=1024)
 def _generate_metric_name(metric_code: str) -> str:
     """Generates a display name from the metric code (e.g., 'market.MarketCapUsd' -> 'Market Cap Usd')."""
     parts = metric_code.split(".")
     name_part = parts[1]
+    # Nothing to split if there are no uppercase letters past the first character
+    if not any(c.isupper() for c in name_part[1:]):
+        return name_part.title()
     # Insert space before uppercase letters (handles CamelCase like MarketCapUsd -> Market Cap Usd)
     # Does not insert space if sequence of capitals like MVRV -> MVRV
-    name_with_spaces = re.sub(r"(?<!^)(?<![A-Z])(?=[A-Z])", " ", name_part)
+    name_with_spaces = _CAMEL_SPLIT_RE.sub(" ", name_part)
     # Capitalize the first letter just in case (e.g. if input was market.marketCap -> Market Cap)
     return name_with_spaces.title()
 
 
-def _find_next_layout_position(
-    layouts: List[Dict[str, Any]],
-    item_height: int = 6,
-    item_width: int = 6,
-    columns: int = 2,
-) -> Tuple[int, int]:
-    """Finds the next available (x, y) position in a grid layout."""
-    occupied = set()
-    max_y = -item_height  # Start checking from y=0
+def _uuid_stream(batch: int = 256) -> Iterator[str]:
+    """
+    Yields random (version 4) UUID strings, drawing random bytes for a whole batch at once.
+    """
+    while True:
+        buf = bytearray(os.urandom(16 * batch))
+        # Set the version and variant bits like uuid.uuid4() does
+        for offset in range(0, len(buf), 16):
+            buf[offset + 6] = (buf[offset + 6] & 0x0F) | 0x40
+            buf[offset + 8] = (buf[offset + 8] & 0x3F) | 0x80
+        # Format straight from one hex string instead of building a uuid.UUID per value
+        hex_str = buf.hex()
+        for o in range(0, len(hex_str), 32):
+            h = hex_str[o : o + 32]
+            yield f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
-    for item in layouts:
-        occupied.add((item["x"], item["y"]))
-        max_y = max(max_y, item["y"])
 
-    target_y = 0
-    while True:
-        for col_index in range(columns):
-            target_x = col_index * item_width
-            if (target_x, target_y) not in occupied:
-                return target_x, target_y
-        target_y += item_height
+_uuid_gen = _uuid_stream()
+# Builds may run on several threads and a generator can't be advanced concurrently
+_uuid_lock = threading.Lock()
+
+
+def _reset_uuid_stream() -> None:
+    """Start a fresh UUID stream so a forked child doesn't hand out the parent's buffered values."""
+    global _uuid_gen, _uuid_lock
+    _uuid_gen = _uuid_stream()
+    # The lock may have been held by another thread at fork time
+    _uuid_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_uuid_stream)
+
+
+def _next_uuid() -> str:
+    with _uuid_lock:
+        return next(_uuid_gen)
 
 
 def build_metric_config(
@@ -135,85 +233,42 @@ def build_metric_config(
     Returns:
         MetricConfig object
     """
-    # Get all applicable defaults for this metric-asset combination
-    defaults = _get_defaults_for_metric(metric_code, asset.upper())
+    # Get all applicable defaults for this metric-asset combination, split by model
+    meta_defaults, extra_defaults = _get_routed_defaults(metric_code, asset.upper())
 
     # Generate UUID and name if not provided
     if uuid_str is None:
-        uuid_str = str(uuid.uuid4())
+        uuid_str = _next_uuid()
 
     if name is None:
         name = _generate_metric_name(metric_code)
 
-    # Define which fields belong to meta vs extra
-    meta_fields = {
-        "date",
-        "since",
-        "until",
-        "currency",
-        "chartType",
-        "resolution",
-        "exchange",
-        "period",
-        "movingMedian",
-        "movingAverage",
-        "expMovingAverage",
-    }
-    extra_fields = {"zoom", "scale", "lineColor", "price", "chartStyle", "logTickInterval"}
-
-    # Build meta kwargs
-    meta_kwargs = {
-        "metricCode": metric_code,
-        "asset": asset.upper(),
-    }
-
-    # Apply defaults for meta fields
-    for field, value in defaults.items():
-        if field in meta_fields:
-            meta_kwargs[field] = value
-
-    # Apply explicit overrides for all meta fields
-    if date is not None:
-        meta_kwargs["date"] = date
-    if since is not None:
-        meta_kwargs["since"] = since
-    if until is not None:
-        meta_kwargs["until"] = until
-    if currency is not None:
-        meta_kwargs["currency"] = currency
-    if chartType is not None:
-        meta_kwargs["chartType"] = chartType
-    if resolution is not None:
-        meta_kwargs["resolution"] = resolution
-    if exchange is not None:
-        meta_kwargs["exchange"] = exchange
-    if period is not None:
-        meta_kwargs["period"] = period
+    meta_kwargs = dict(meta_defaults)
+    extra_kwargs = {"name": name, **extra_defaults}
+    kwargs_by_bucket = {"meta": meta_kwargs, "extra": extra_kwargs}
+
+    # Apply explicit overrides for all meta and extra fields
+    explicit_overrides = (
+        ("date", date),
+        ("since", since),
+        ("until", until),
+        ("currency", currency),
+        ("chartType", chartType),
+        ("resolution", resolution),
+        ("exchange", exchange),
+        ("period", period),
+        ("zoom", zoom),
+        ("scale", scale),
+        ("lineColor", lineColor),
+        ("price", price),
+        ("chartStyle", chartStyle),
+        ("logTickInterval", logTickInterval),
+    )
+    for field, value in explicit_overrides:
+        if value is not None:
+            kwargs_by_bucket[_FIELD_BUCKET[field]][field] = value
 
     meta = MetricMeta(**meta_kwargs)
-
-    # Build extra kwargs
-    extra_kwargs = {"name": name}
-
-    # Apply defaults for extra fields
-    for field, value in defaults.items():
-        if field in extra_fields:
-            extra_kwargs[field] = value
-
-    # Apply explicit overrides for all extra fields
-    if zoom is not None:
-        extra_kwargs["zoom"] = zoom
-    if scale is not None:
-        extra_kwargs["scale"] = scale
-    if lineColor is not None:
-        extra_kwargs["lineColor"] = lineColor
-    if price is not None:
-        extra_kwargs["price"] = price
-    if chartStyle is not None:
-        extra_kwargs["chartStyle"] = chartStyle
-    if logTickInterval is not None:
-        extra_kwargs["logTickInterval"] = logTickInterval
-
     extra = MetricExtra(**extra_kwargs)
 
     return MetricConfig(uuid=uuid_str, meta=meta, extra=extra, configType="metric")
@@ -229,30 +284,79 @@ def generate_layout(metric_configs: List[MetricConfig]) -> List[LayoutItem]:
     Returns:
         List of LayoutItem objects
     """
+    # All items share the same size on a fixed-width grid, so the position follows directly from the index
+    columns = 2
+    item_size = 6
     layouts = []
+    for index, config in enumerate(metric_configs):
+        row, col = divmod(index, columns)
+        layouts.append(
+            _construct(
+                LayoutItem,
+                i=config.uuid,
+                x=col * item_size,
+                y=row * item_size,
+                h=item_size,  # Use defaults from LayoutItem model
+                w=item_size,
+                minH=1,
+                minW=3,
+                moved=False,
+                static=False,
+            )
+        )
+    return layouts
+
+
+def _parse_str_spec(metric_spec: str, asset: Optional[str]) -> Tuple[str, Optional[str], Dict[str, Any]]:
+    # Simple string format
+    return metric_spec, asset, {}
+
+
+def _parse_dict_spec(metric_spec: Dict[str, Any], asset: Optional[str]) -> Tuple[str, Optional[str], Dict[str, Any]]:
+    # Dict format with overrides
+    metric_code = metric_spec.get("code") or metric_spec.get("metricCode")
+    if not metric_code:
+        raise ValueError("Metric specification must include 'code' or 'metricCode'")
+
+    metric_asset = metric_spec.get("asset", asset)
 
-    for i, config in enumerate(metric_configs):
-        if i == 0:
-            x, y = 0, 0
+    # Extract overrides (everything except 'code' and 'asset')
+    metric_overrides = {k: v for k, v in metric_spec.items() if k not in ["code", "metricCode", "asset"]}
+    return metric_code, metric_asset, metric_overrides
+
+
+# Metric specification parsers by exact type; subclasses fall back to an isinstance check
+_METRIC_SPEC_PARSERS = {str: _parse_str_spec, dict: _parse_dict_spec}
+
+
+def _parse_metric_spec(
+    metric_spec: Union[str, Dict[str, Any]], asset: Optional[str], dashboard_overrides: Dict[str, Any]
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Resolves a metric specification to its metric code, asset and merged overrides.
+    Metric-specific overrides take precedence over dashboard overrides.
+    """
+    parser = _METRIC_SPEC_PARSERS.get(type(metric_spec))
+    if parser is None:
+        for spec_type, spec_parser in _METRIC_SPEC_PARSERS.items():
+            if isinstance(metric_spec, spec_type):
+                parser = spec_parser
+                break
         else:
-            # Convert LayoutItem objects to dicts for the existing function
-            layout_dicts = [{"x": layout.x, "y": layout.y, "h": layout.h, "w": layout.w} for layout in layouts]
-            x, y = _find_next_layout_position(layout_dicts)
-
-        layout = LayoutItem(
-            i=config.uuid,
-            x=x,
-            y=y,
-            h=6,  # Use defaults from LayoutItem model
-            w=6,
-            minH=1,
-            minW=3,
-            moved=False,
-            static=False,
-        )
-        layouts.append(layout)
+            raise ValueError(f"Invalid metric specification: {metric_spec}")
 
-    return layouts
+    metric_code, metric_asset, metric_overrides = parser(metric_spec, asset)
+
+    if not metric_asset:
+        raise ValueError(f"No asset specified for metric: {metric_code}")
+
+    # Merge dashboard overrides with metric-specific overrides. The result is only unpacked into
+    # build_metric_config's keyword arguments, so either side can be passed on as-is when the other is empty.
+    if not metric_overrides:
+        return metric_code, metric_asset, dashboard_overrides
+    if not dashboard_overrides:
+        return metric_code, metric_asset, metric_overrides
+    return metric_code, metric_asset, {**dashboard_overrides, **metric_overrides}
 
 
 def build_dashboard(
@@ -302,43 +406,52 @@ def build_dashboard(
     if dashboard_overrides is None:
         dashboard_overrides = {}
 
-    metric_configs = []
-
-    for metric_spec in metrics:
-        # Parse metric specification
-        if isinstance(metric_spec, str):
-            # Simple string format
-            metric_code = metric_spec
-            metric_asset = asset
-            metric_overrides = {}
-        elif isinstance(metric_spec, dict):
-            # Dict format with overrides
-            metric_code = metric_spec.get("code") or metric_spec.get("metricCode")
-            if not metric_code:
-                raise ValueError("Metric specification must include 'code' or 'metricCode'")
-
-            metric_asset = metric_spec.get("asset", asset)
-
-            # Extract overrides (everything except 'code' and 'asset')
-            metric_overrides = {k: v for k, v in metric_spec.items() if k not in ["code", "metricCode", "asset"]}
-        else:
-            raise ValueError(f"Invalid metric specification: {metric_spec}")
-
-        if not metric_asset:
-            raise ValueError(f"No asset specified for metric: {metric_code}")
-
-        # Merge dashboard overrides with metric-specific overrides
-        all_overrides = {**dashboard_overrides, **metric_overrides}
-
-        # Create metric config
-        config = build_metric_config(metric_code=metric_code, asset=metric_asset, **all_overrides)
-        metric_configs.append(config)
+    metric_configs = [
+        build_metric_config(metric_code=metric_code, asset=metric_asset, **overrides)
+        for metric_code, metric_asset, overrides in (
+            _parse_metric_spec(metric_spec, asset, dashboard_overrides) for metric_spec in metrics
+        )
+    ]
 
     # Generate layouts
     layouts = generate_layout(metric_configs)
 
     # Create dashboard
-    return Dashboard(meta=DashboardMeta(name=name), configs=metric_configs, layouts=layouts)
+    return _construct(Dashboard, meta=DashboardMeta(name=name), configs=metric_configs, layouts=layouts)
+
+
+# Top-level fields of a specification file and the types they must have
+_REQUIRED_SPEC_FIELDS = (("name", str), ("metrics", list))
+_OPTIONAL_SPEC_FIELDS = (("asset", str), ("dashboardOverrides", dict), ("common_overrides", dict))
+
+
+def _validate_spec(spec: Any) -> None:
+    """
+    Checks the top-level structure of a parsed specification file.
+    Raises KeyError for a missing required field and TypeError for a value of the wrong type.
+    """
+    if not isinstance(spec, dict):
+        raise TypeError(f"Dashboard specification must be a JSON object, got {type(spec).__name__}")
+    for field, field_type in _REQUIRED_SPEC_FIELDS:
+        if field not in spec:
+            raise KeyError(f"Dashboard specification is missing required field '{field}'")
+        if not isinstance(spec[field], field_type):
+            raise TypeError(f"Dashboard specification field '{field}' must be of type {field_type.__name__}")
+    for field, field_type in _OPTIONAL_SPEC_FIELDS:
+        value = spec.get(field)
+        if value is not None and not isinstance(value, field_type):
+            raise TypeError(f"Dashboard specification field '{field}' must be of type {field_type.__name__}")
+
+
+@lru_cache(maxsize=256)
+def _load_spec_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Parse and validate a JSON specification file. Cached by path, modification time and size, so
+    unchanged files are not re-read on repeated builds. The result is shared, do not mutate it.
+    """
+    spec = json.loads(Path(path_str).read_bytes())
+    _validate_spec(spec)
+    return spec
 
 
 def build_dashboard_from_file(file_path: Union[str, Path]) -> Dashboard:
@@ -374,10 +487,30 @@ def build_dashboard_from_file(file_path: Union[str, Path]) -> Dashboard:
         }
     """
     file_path = Path(file_path)
+    stat = file_path.stat()
+    spec = _load_spec_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+    return _build_dashboard_from_spec(spec)
+
+
+def build_dashboard_from_json(data: Union[str, bytes, Dict[str, Any]]) -> Dashboard:
+    """
+    Creates a dashboard from a JSON specification held in memory, without touching disk.
+
+    Args:
+        data: JSON text or bytes, or an already parsed specification dict
+              (same format as for build_dashboard_from_file)
+
+    Returns:
+        Dashboard object
+    """
+    spec = data if isinstance(data, dict) else json.loads(data)
+    _validate_spec(spec)
 
-    with open(file_path, "r") as f:
-        spec = json.load(f)
+    return _build_dashboard_from_spec(spec)
 
+
+def _build_dashboard_from_spec(spec: Dict[str, Any]) -> Dashboard:
     return build_dashboard(
         name=spec["name"],
         metrics=spec["metrics"],
@@ -386,6 +519,39 @@ def build_dashboard_from_file(file_path: Union[str, Path]) -> Dashboard:
     )
 
 
+@lru_cache(maxsize=16)
+def _glob_matcher(pattern: str) -> Callable[[str], Any]:
+    """Compiled name matcher for a glob pattern, with a plain suffix check for the default "*.json"."""
+    if pattern == "*.json":
+        return lambda name: name.endswith(".json")
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+def _iter_json(root: Path, pattern: str = "*.json") -> Iterator[Path]:
+    """
+    Recursively yields files under root whose name matches pattern.
+    Walks with os.scandir so entry types come from the directory listing instead of extra stat() calls,
+    and only builds Path objects for matching files. Like Path.rglob, unreadable directories are skipped.
+    """
+    if "/" in pattern or os.sep in pattern:
+        # Patterns spanning directories match against the relative path, which Path.rglob handles
+        yield from root.rglob(pattern)
+        return
+
+    matches = _glob_matcher(pattern)
+    try:
+        entries = os.scandir(root)
+    except PermissionError:
+        return
+    with entries:
+        for entry in entries:
+            # Symlinked directories are not followed (like Path.rglob), so a link loop can't recurse forever
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_json(Path(entry.path), pattern)
+            elif matches(entry.name):
+                yield Path(entry.path)
+
+
 def build_dashboards_from_directory(
     directory_path: Union[str, Path], pattern: str = "*.json"
 ) -> Dict[Path, Dashboard]:
@@ -410,20 +576,19 @@ def build_dashboards_from_directory(
         raise ValueError(f"Not a directory: {directory_path}")
 
     dashboards = {}
-    
-    # Use rglob for recursive search
-    json_files = list(directory_path.rglob(pattern))
-
-    if not json_files:
-        raise ValueError(f"No JSON files found recursively in {directory_path} matching pattern '{pattern}'")
+    found = False
 
-    for json_file in json_files:
+    # Builds are CPU-bound pure Python, so they run sequentially in discovery order
+    for json_file in _iter_json(directory_path, pattern):
+        found = True
         try:
-            dashboard = build_dashboard_from_file(json_file)
-            dashboards[json_file] = dashboard
+            dashboards[json_file] = build_dashboard_from_file(json_file)
         except Exception as e:
             # Log error but continue with other files
             print(f"Error building dashboard from {json_file}: {e}")
             continue
 
+    if not found:
+        raise ValueError(f"No JSON files found recursively in {directory_path} matching pattern '{pattern}'")
+
     return dashboards
@@ -1,9 +1,25 @@
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-from typing import Dict, Any, Union, List
+from typing import Dict, Any, Union, List, Optional, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+__all__ = [
+    "DEFAULT_CATEGORY",
+    "MAPPINGS_FILE",
+    "load_mappings",
+    "save_mapping",
+    "invalidate_category",
+    "update_dashboard",
+    "create_dashboard",
+    "create_or_update_dashboard",
+    "create_dashboards",
+    "update_dashboards",
+]
 
 load_dotenv()
 
@@ -17,25 +33,97 @@ DEFAULT_CATEGORY = CATEGORY_UUID if CATEGORY_UUID else "My Dashboards"
 
 MAPPINGS_FILE = ".dashboard_mappings.json"
 
+_DASHBOARDS_URL = "https://api.glassnode.com/v1/dashboards"
+_CREATE_URL = f"{_DASHBOARDS_URL}/create"
+# Shared across calls; requests merges it into each request's headers without modifying it
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Last parsed mappings file, keyed by its path, mtime and size so external writes are picked up
+_MAPPINGS_CACHE: Optional[Tuple[Tuple[str, int, int], Dict[str, str]]] = None
+
+# Category UUID per dashboard UUID, so repeat updates can skip the GET that looks it up. Kept in memory
+# for the life of the process only, so each separate CLI run still fetches categories once.
+_CATEGORY_CACHE: Dict[str, str] = {}
+
+# Concurrent uploads for batch operations, matching the session's connection pool size
+_MAX_UPLOAD_WORKERS = 10
+
+# Shared session so consecutive API calls reuse pooled connections instead of a new TLS handshake each.
+# Retry only covers connection/read errors, rate limiting (honouring Retry-After) and server errors on
+# idempotent methods (POST is excluded by urllib3's default allowed_methods, as replaying a create could
+# duplicate the dashboard); the final response is returned so raise_for_status still applies.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,  # every call goes to api.glassnode.com
+        pool_maxsize=_MAX_UPLOAD_WORKERS,
+        max_retries=Retry(
+            total=5,
+            connect=3,
+            read=3,
+            status=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+
+def _mappings_key(stat: os.stat_result) -> Tuple[str, int, int]:
+    # Size as well as mtime, since a quick rewrite can land within the filesystem's timestamp granularity
+    return os.path.abspath(MAPPINGS_FILE), stat.st_mtime_ns, stat.st_size
+
 
 def load_mappings():
     """Load UUID mappings from file, return empty dict if not found"""
+    global _MAPPINGS_CACHE
     try:
-        with open(MAPPINGS_FILE, "r") as f:
-            return json.load(f)
+        key = _mappings_key(os.stat(MAPPINGS_FILE))
     except FileNotFoundError:
         return {}
 
+    cached = _MAPPINGS_CACHE
+    if cached is None or cached[0] != key:
+        with open(MAPPINGS_FILE, "rb") as f:
+            cached = _MAPPINGS_CACHE = (key, json.loads(f.read()))
+
+    # Callers modify the returned dict, so hand out a copy of the cached one
+    return dict(cached[1])
+
 
 def save_mapping(config_path, dashboard_uuid):
     """Save config path to UUID mapping"""
+    global _MAPPINGS_CACHE
     mappings = load_mappings()
     mappings[config_path] = dashboard_uuid
     with open(MAPPINGS_FILE, "w") as f:
         json.dump(mappings, f, indent=2)
+    _MAPPINGS_CACHE = (_mappings_key(os.stat(MAPPINGS_FILE)), mappings)
+
+
+def _dumps_body(payload: Dict[str, Any]) -> bytes:
+    """Serialize a request body as compact UTF-8 JSON (requests' json= adds separator whitespace)"""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def _load_dashboard_payload(dashboard_data: Union[Dict[str, Any], str, Path]) -> Dict[str, Any]:
+    """Return dashboard data as a dict, loading it from file if a path is provided"""
+    if isinstance(dashboard_data, (str, Path)):
+        with open(dashboard_data, "rb") as f:
+            return json.loads(f.read())
+    return dashboard_data
+
 
+def invalidate_category(dashboard_uuid: str):
+    """Forget the cached category UUID of a dashboard so the next update fetches it again"""
+    _CATEGORY_CACHE.pop(dashboard_uuid, None)
 
-def update_dashboard(dashboard_uuid: str, dashboard_data: Union[Dict[str, Any], str, Path]) -> requests.Response:
+
+def update_dashboard(
+    dashboard_uuid: str, dashboard_data: Union[Dict[str, Any], str, Path], category_uuid: Optional[str] = None
+) -> requests.Response:
     """
     Update a Glassnode dashboard via their API.
     If the dashboard doesn't exist (404), falls back to creating a new one.
@@ -43,51 +131,60 @@ def update_dashboard(dashboard_uuid: str, dashboard_data: Union[Dict[str, Any],
     Args:
         dashboard_uuid: The UUID of the dashboard to update
         dashboard_data: Either a dict with dashboard config or path to JSON file
+        category_uuid: Known category of the dashboard; skips fetching it from the API when given
 
     Returns:
         Response object from the API call
     """
-    # Store the original dashboard_data path if it's a file
-    original_data = dashboard_data
+    # Parsed once and reused if we fall back to creating the dashboard
+    dashboard_data = _load_dashboard_payload(dashboard_data)
 
-    # Load from file if path provided
-    if isinstance(dashboard_data, (str, Path)):
-        with open(dashboard_data, "r") as f:
-            dashboard_data = json.load(f)
-
-    # First, get the current dashboard to retrieve its category UUID
+    url = f"{_DASHBOARDS_URL}/{dashboard_uuid}"
     params = {"api_key": API_KEY}
     try:
-        response = requests.get(f"https://api.glassnode.com/v1/dashboards/{dashboard_uuid}", params=params)
-        response.raise_for_status()
-
-        current_dashboard = response.json()
-        category_uuid = current_dashboard.get("categoryUuid", DEFAULT_CATEGORY)
+        # Fetch the current dashboard to retrieve its category UUID, unless it is already known
+        if category_uuid is None:
+            category_uuid = _CATEGORY_CACHE.get(dashboard_uuid)
+        cacheable = category_uuid is not None
+        if category_uuid is None:
+            response = _SESSION.get(url, params=params)
+            response.raise_for_status()
+
+            current_dashboard = response.json()
+            category_uuid = current_dashboard.get("categoryUuid")
+            # A missing category is not cached, so a later change to DEFAULT_CATEGORY still applies
+            cacheable = category_uuid is not None
+            if category_uuid is None:
+                category_uuid = DEFAULT_CATEGORY
 
         # Wrap dashboard data with category UUID
-        dashboard_data = {"categoryUuid": category_uuid, "data": dashboard_data}
+        payload = {"categoryUuid": category_uuid, "data": dashboard_data}
 
         # Update the dashboard
-        url = f"https://api.glassnode.com/v1/dashboards/{dashboard_uuid}"
-
-        headers = {"content-type": "application/json"}
-
-        response = requests.put(url, json=dashboard_data, headers=headers, params=params)
+        response = _SESSION.put(url, data=_dumps_body(payload), headers=_JSON_HEADERS, params=params)
         response.raise_for_status()
 
+        # Only remember the category once the API has accepted it
+        if cacheable:
+            _CATEGORY_CACHE[dashboard_uuid] = category_uuid
+
         return response
 
     except requests.HTTPError as e:
+        # The cached category may be stale (e.g. dashboard deleted or moved)
+        invalidate_category(dashboard_uuid)
         if e.response.status_code == 404:
             # Dashboard doesn't exist, create a new one instead
             print(f"  Dashboard {dashboard_uuid} not found, creating new dashboard instead...")
-            return create_dashboard(original_data)
+            return create_dashboard(dashboard_data)
         else:
             # Re-raise other HTTP errors
             raise
 
 
-def create_dashboard(dashboard_data: Union[Dict[str, Any], str, Path], category_uuid: str = None) -> requests.Response:
+def create_dashboard(
+    dashboard_data: Union[Dict[str, Any], str, Path], category_uuid: Optional[str] = None
+) -> requests.Response:
     """
     Create a new Glassnode dashboard via their API.
 
@@ -102,36 +199,30 @@ def create_dashboard(dashboard_data: Union[Dict[str, Any], str, Path], category_
     if category_uuid is None:
         category_uuid = DEFAULT_CATEGORY
 
-    # Load from file if path provided
-    if isinstance(dashboard_data, (str, Path)):
-        with open(dashboard_data, "r") as f:
-            dashboard_data = json.load(f)
+    dashboard_data = _load_dashboard_payload(dashboard_data)
 
     # Wrap in expected format if not already wrapped
     if "categoryUuid" not in dashboard_data:
         dashboard_data = {"categoryUuid": category_uuid, "data": dashboard_data}
 
-    url = "https://api.glassnode.com/v1/dashboards/create"
-
-    headers = {"content-type": "application/json"}
-
     params = {"api_key": API_KEY}
 
-    response = requests.post(url, json=dashboard_data, headers=headers, params=params)
+    response = _SESSION.post(_CREATE_URL, data=_dumps_body(dashboard_data), headers=_JSON_HEADERS, params=params)
     response.raise_for_status()
 
     return response
 
 
 def create_or_update_dashboard(
-    dashboard_data: Union[Dict[str, Any], str, Path], category_uuid: str = None
+    dashboard_data: Union[Dict[str, Any], str, Path], category_uuid: Optional[str] = None
 ) -> requests.Response:
     """
     Create or update a dashboard based on existing mappings.
 
     Args:
         dashboard_data: Either a dict with dashboard config or path to JSON file
-        category_uuid: Category for the dashboard (defaults to GLASSNODE_CATEGORY_UUID env var or "My Dashboards")
+        category_uuid: Category for a newly created dashboard (defaults to GLASSNODE_CATEGORY_UUID env var or
+                       "My Dashboards"); an existing dashboard keeps its current category
 
     Returns:
         Response object from the API call
@@ -146,7 +237,7 @@ def create_or_update_dashboard(
         # Derive config path from dashboard path
         config_path = str(
             Path(str(dashboard_data.parent).replace("dashboards", "configs", 1))
-            / (dashboard_data.stem.replace("_dashboard", "") + ".json")
+            / (dashboard_data.stem.removesuffix("_dashboard") + ".json")
         )
 
         if config_path in mappings:
@@ -159,7 +250,7 @@ def create_or_update_dashboard(
 
 
 def create_dashboards(
-    dashboard_files: Union[List[Union[str, Path]], str, Path], category_uuid: str = None
+    dashboard_files: Union[List[Union[str, Path]], str, Path], category_uuid: Optional[str] = None
 ) -> Dict[Path, requests.Response]:
     """
     Create multiple Glassnode dashboards via their API.
@@ -185,37 +276,46 @@ def create_dashboards(
     if isinstance(dashboard_files, (str, Path)):
         directory = Path(dashboard_files)
         if directory.is_dir():
-            dashboard_files = list(directory.rglob("*.json"))
+            # Left lazy so uploads start while the directory is still being walked
+            dashboard_files = directory.rglob("*.json")
         else:
             dashboard_files = [dashboard_files]
 
     responses = {}
 
-    for file_path in dashboard_files:
-        file_path = Path(file_path)
-        try:
-            response = create_or_update_dashboard(file_path, category_uuid)
-            responses[file_path] = response
-            print(f"✓ Processed dashboard from {file_path}")
-        except Exception as e:
-            print(f"✗ Failed to process dashboard from {file_path}: {e}")
-
-            # Store the exception as a mock response for consistency
-            class ErrorResponse:
-                def __init__(self, error):
-                    self.error = error
-                    self.status_code = 500
-
-                def json(self):
-                    return {"error": str(self.error)}
-
-            responses[file_path] = ErrorResponse(e)
+    # Uploads are independent and network-bound, so overlap them; results are reported in input order.
+    # Worker threads are only started as tasks are submitted, so small batches don't spawn the full pool.
+    with ThreadPoolExecutor(max_workers=_MAX_UPLOAD_WORKERS) as executor:
+        futures = [
+            (file_path, executor.submit(create_or_update_dashboard, file_path, category_uuid))
+            for file_path in map(Path, dashboard_files)
+        ]
+
+        for file_path, future in futures:
+            try:
+                response = future.result()
+                responses[file_path] = response
+                print(f"✓ Processed dashboard from {file_path}")
+            except Exception as e:
+                print(f"✗ Failed to process dashboard from {file_path}: {e}")
+
+                # Store the exception as a mock response for consistency
+                class ErrorResponse:
+                    def __init__(self, error):
+                        self.error = error
+                        self.status_code = 500
+
+                    def json(self):
+                        return {"error": str(self.error)}
+
+                responses[file_path] = ErrorResponse(e)
 
     return responses
 
 
 def update_dashboards(
     dashboard_mapping: Union[Dict[str, Union[str, Path]], List[tuple], str, Path],
+    category_uuid: Optional[str] = None,
 ) -> Dict[str, requests.Response]:
     """
     Update multiple Glassnode dashboards via their API.
@@ -225,6 +325,7 @@ def update_dashboards(
             - Dict mapping UUIDs to dashboard file paths
             - List of (uuid, file_path) tuples
             - Directory path (will use .dashboard_mappings.json for UUID lookup)
+        category_uuid: Known category of the dashboards; skips fetching each one's category when given
 
     Returns:
         Dictionary mapping UUIDs to Response objects
@@ -249,28 +350,26 @@ def update_dashboards(
     if isinstance(dashboard_mapping, (str, Path)):
         directory = Path(dashboard_mapping)
         if directory.is_dir():
-            mappings_file = Path(".dashboard_mappings.json")
+            mappings_file = Path(MAPPINGS_FILE)
             if not mappings_file.exists():
                 raise ValueError("No .dashboard_mappings.json file found for UUID lookups")
 
-            with open(mappings_file, "r") as f:
-                all_mappings = json.load(f)
+            all_mappings = load_mappings()
+
+            # Dashboards present in the target directory (recursive), collected in one walk
+            # instead of a stat per mapping entry. Absolute paths so relative mappings still
+            # match when the directory is given as an absolute path (and vice versa).
+            existing = {os.path.abspath(path) for path in directory.rglob("*.json")}
 
             # Filter mappings for dashboards in this directory
             dashboard_mapping = {}
             for config_path, uuid in all_mappings.items():
                 # Convert config path to dashboard path
-                dashboard_path = Path(str(Path(config_path).parent).replace("configs", "dashboards", 1)) / (
-                    Path(config_path).stem + "_dashboard.json"
+                config_path = Path(config_path)
+                dashboard_path = Path(str(config_path.parent).replace("configs", "dashboards", 1)) / (
+                    config_path.stem + "_dashboard.json"
                 )
-                # Check if dashboard is in the target directory (recursive search)
-                try:
-                    dashboard_path.relative_to(directory)
-                    is_in_directory = dashboard_path.exists()
-                except ValueError:
-                    is_in_directory = False
-                
-                if is_in_directory:
+                if os.path.abspath(dashboard_path) in existing:
                     dashboard_mapping[uuid] = dashboard_path
 
             if not dashboard_mapping:
@@ -280,26 +379,34 @@ def update_dashboards(
     elif isinstance(dashboard_mapping, list):
         dashboard_mapping = dict(dashboard_mapping)
 
+    items = [(uuid, Path(file_path)) for uuid, file_path in dashboard_mapping.items()]
     responses = {}
 
-    for uuid, file_path in dashboard_mapping.items():
-        file_path = Path(file_path)
-        try:
-            response = update_dashboard(uuid, file_path)
-            responses[uuid] = response
-            print(f"✓ Updated dashboard {uuid} from {file_path}")
-        except Exception as e:
-            print(f"✗ Failed to update dashboard {uuid} from {file_path}: {e}")
-
-            # Store the exception as a mock response
-            class ErrorResponse:
-                def __init__(self, error):
-                    self.error = error
-                    self.status_code = 500
-
-                def json(self):
-                    return {"error": str(self.error)}
-
-            responses[uuid] = ErrorResponse(e)
+    # Each update is a GET followed by a PUT, so run them concurrently and let the round-trips overlap.
+    # Results are reported in input order once each future completes.
+    with ThreadPoolExecutor(max_workers=max(1, min(_MAX_UPLOAD_WORKERS, len(items)))) as executor:
+        futures = [
+            (uuid, file_path, executor.submit(update_dashboard, uuid, file_path, category_uuid))
+            for uuid, file_path in items
+        ]
+
+        for uuid, file_path, future in futures:
+            try:
+                response = future.result()
+                responses[uuid] = response
+                print(f"✓ Updated dashboard {uuid} from {file_path}")
+            except Exception as e:
+                print(f"✗ Failed to update dashboard {uuid} from {file_path}: {e}")
+
+                # Store the exception as a mock response
+                class ErrorResponse:
+                    def __init__(self, error):
+                        self.error = error
+                        self.status_code = 500
+
+                    def json(self):
+                        return {"error": str(self.error)}
+
+                responses[uuid] = ErrorResponse(e)
 
     return responses
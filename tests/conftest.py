@@ -0,0 +1,13 @@
+"""Shared pytest configuration for the dashboard builder test suite"""
+
+import os
+import sys
+from pathlib import Path
+
+# Make the top-level modules importable regardless of where pytest is invoked from
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+# dashboard_client refuses to import without an API key; tests never reach the real API
+os.environ.setdefault("GLASSNODE_API_KEY", "test-key")
@@ -1,21 +1,28 @@
 """Tests for dashboard_builder.py - focusing on core dashboard building functionality"""
 
-import sys
+import os
+import uuid
 import json
 import tempfile
+from collections import namedtuple
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+from pydantic import ValidationError
 
 from dashboard_builder import (
     build_dashboard,
     build_dashboard_from_file,
+    build_dashboard_from_json,
     build_metric_config,
     generate_layout,
     build_dashboards_from_directory,
+    _uuid_stream,
 )
 
+# Stand-in for MetricConfig; generate_layout only reads .uuid
+_Cfg = namedtuple("_Cfg", "uuid")
+
 
 def test_build_metric_config():
     """Test building individual metric configurations"""
@@ -63,28 +70,82 @@ def test_build_metric_config():
     assert config.meta.resolution == "1h"  # From derivatives.FuturesFundingRate*
 
     # Failing case - missing required asset
-    try:
+    with pytest.raises(AttributeError):  # Tries to call .upper() on None
         build_metric_config(metric_code="market.Price", asset=None)
-        assert False, "Should require asset"
-    except AttributeError:
-        pass  # Expected - tries to call .upper() on None
 
-    # Failing case - empty asset
-    try:
-        build_metric_config(metric_code="market.Price", asset="")
-        # Empty string is actually allowed, just becomes empty
-        pass
-    except Exception:
-        assert False, "Empty string should be allowed"
+    # Edge case - empty asset is actually allowed, just becomes empty
+    build_metric_config(metric_code="market.Price", asset="")
+
+
+def _assert_uuid4(value):
+    parsed = uuid.UUID(value)
+    assert str(parsed) == value
+    assert parsed.version == 4
+    assert parsed.variant == uuid.RFC_4122
+
+
+def test_generated_uuids():
+    """Test that metric configs get distinct random (version 4) UUIDs"""
+    # Expected use - every config gets its own well-formed UUID
+    uuids = [build_metric_config(metric_code="market.PriceUsd", asset="BTC").uuid for _ in range(50)]
+    for value in uuids:
+        _assert_uuid4(value)
+    assert len(set(uuids)) == len(uuids)
+
+    # Edge case - an explicit UUID is kept as-is
+    assert build_metric_config(metric_code="market.PriceUsd", asset="BTC", uuid_str="fixed").uuid == "fixed"
+
+
+def test_uuid_stream_batches(monkeypatch):
+    """Test that UUIDs are cut from one random draw per batch and stay valid across batches"""
+    draws = []
+    urandom = os.urandom
+    monkeypatch.setattr(os, "urandom", lambda n: draws.append(n) or urandom(n))
+
+    stream = _uuid_stream(batch=2)
+    uuids = [next(stream) for _ in range(5)]
+
+    # Five values from batches of two need three draws of 2 * 16 bytes
+    assert draws == [32, 32, 32]
+    for value in uuids:
+        _assert_uuid4(value)
+    assert len(set(uuids)) == len(uuids)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_generated_uuids_after_fork():
+    """Test that a forked child does not repeat the parent's UUIDs"""
+    # Make sure the parent has buffered UUIDs before forking
+    build_metric_config(metric_code="market.PriceUsd", asset="BTC")
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Never return into pytest from the child, whatever happens here
+        exit_code = 1
+        try:
+            os.close(read_fd)
+            child_uuid = build_metric_config(metric_code="market.PriceUsd", asset="BTC").uuid
+            os.write(write_fd, child_uuid.encode())
+            exit_code = 0
+        finally:
+            os._exit(exit_code)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        child_uuid = pipe.read()
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    parent_uuid = build_metric_config(metric_code="market.PriceUsd", asset="BTC").uuid
+    _assert_uuid4(child_uuid)
+    assert child_uuid != parent_uuid
 
 
 def test_generate_layout():
     """Test dashboard layout generation"""
     # Expected use - standard 2x2 grid
-    configs = []
-    for i in range(4):
-        config = type("Config", (), {"uuid": f"uuid-{i}"})()
-        configs.append(config)
+    configs = [_Cfg(f"uuid-{i}") for i in range(4)]
 
     layouts = generate_layout(configs)
     assert len(layouts) == 4
@@ -100,21 +161,21 @@ def test_generate_layout():
     assert layouts[3].x == 6 and layouts[3].y == 6
 
     # Edge case - single metric
-    configs = [type("Config", (), {"uuid": "single-uuid"})()]
+    configs = [_Cfg("single-uuid")]
     layouts = generate_layout(configs)
     assert len(layouts) == 1
     assert layouts[0].x == 0 and layouts[0].y == 0
     assert layouts[0].w == 6 and layouts[0].h == 6
 
     # Edge case - odd number of metrics (5)
-    configs = [type("Config", (), {"uuid": f"uuid-{i}"})() for i in range(5)]
+    configs = [_Cfg(f"uuid-{i}") for i in range(5)]
     layouts = generate_layout(configs)
     assert len(layouts) == 5
     # Third row starts at y=12
     assert layouts[4].x == 0 and layouts[4].y == 12
 
     # Edge case - many metrics (10)
-    configs = [type("Config", (), {"uuid": f"uuid-{i}"})() for i in range(10)]
+    configs = [_Cfg(f"uuid-{i}") for i in range(10)]
     layouts = generate_layout(configs)
     assert len(layouts) == 10
     # Should have 5 rows
@@ -200,42 +261,34 @@ def test_build_dashboard():
     assert len(dashboard.layouts) == 0
 
     # Failing case - metric dict without code/metricCode
-    try:
+    with pytest.raises(ValueError, match="must include 'code' or 'metricCode'"):
         build_dashboard(
             name="Invalid",
             metrics=[{"asset": "BTC", "resolution": "1h"}],  # No code!
         )
-        assert False, "Should require code or metricCode"
-    except ValueError as e:
-        assert "must include 'code' or 'metricCode'" in str(e)
 
     # Failing case - no asset anywhere
-    try:
+    with pytest.raises(ValueError, match="No asset specified"):
         build_dashboard(
             name="No Asset",
             metrics=["market.Price"],  # No default asset, no asset in metric
         )
-        assert False, "Should require asset"
-    except ValueError as e:
-        assert "No asset specified" in str(e)
 
 
-def test_build_dashboard_from_file():
+def test_build_dashboard_from_file(tmp_path):
     """Test building dashboards from JSON files"""
     # Expected use - basic config file
     config = {"name": "Test Dashboard", "asset": "BTC", "metrics": ["market.Price", "market.Volume"]}
+    config_path = tmp_path / "basic.json"
+    config_path.write_text(json.dumps(config))
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(config, f)
-        temp_path = f.name
+    dashboard = build_dashboard_from_file(config_path)
+    assert dashboard.meta.name == "Test Dashboard"
+    assert len(dashboard.configs) == 2
+    assert all(c.meta.asset == "BTC" for c in dashboard.configs)
 
-    try:
-        dashboard = build_dashboard_from_file(temp_path)
-        assert dashboard.meta.name == "Test Dashboard"
-        assert len(dashboard.configs) == 2
-        assert all(c.meta.asset == "BTC" for c in dashboard.configs)
-    finally:
-        Path(temp_path).unlink()
+    # Expected use - path given as a string
+    assert build_dashboard_from_file(str(config_path)).meta.name == "Test Dashboard"
 
     # Expected use - with common overrides
     config_with_overrides = {
@@ -244,17 +297,12 @@ def test_build_dashboard_from_file():
         "metrics": ["market.Price"],
         "dashboardOverrides": {"resolution": "1h", "currency": "EUR"},
     }
+    config_path = tmp_path / "overrides.json"
+    config_path.write_text(json.dumps(config_with_overrides))
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(config_with_overrides, f)
-        temp_path = f.name
-
-    try:
-        dashboard = build_dashboard_from_file(temp_path)
-        assert dashboard.configs[0].meta.resolution == "1h"
-        assert dashboard.configs[0].meta.currency == "EUR"
-    finally:
-        Path(temp_path).unlink()
+    dashboard = build_dashboard_from_file(config_path)
+    assert dashboard.configs[0].meta.resolution == "1h"
+    assert dashboard.configs[0].meta.currency == "EUR"
 
     # Edge case - complex multi-asset config
     complex_config = {
@@ -265,54 +313,45 @@ def test_build_dashboard_from_file():
             {"metricCode": "derivatives.FuturesVolume", "asset": "SOL"},
         ],
     }
+    config_path = tmp_path / "complex.json"
+    config_path.write_text(json.dumps(complex_config))
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(complex_config, f)
-        temp_path = f.name
-
-    try:
-        dashboard = build_dashboard_from_file(temp_path)
-        assert len(dashboard.configs) == 3
-        assert dashboard.configs[0].meta.asset == "BTC"
-        assert dashboard.configs[1].meta.asset == "ETH"
-        assert dashboard.configs[1].meta.resolution == "1h"
-        assert dashboard.configs[2].meta.asset == "SOL"
-    finally:
-        Path(temp_path).unlink()
+    dashboard = build_dashboard_from_file(config_path)
+    assert len(dashboard.configs) == 3
+    assert dashboard.configs[0].meta.asset == "BTC"
+    assert dashboard.configs[1].meta.asset == "ETH"
+    assert dashboard.configs[1].meta.resolution == "1h"
+    assert dashboard.configs[2].meta.asset == "SOL"
 
     # Edge case - minimal config
     minimal_config = {"name": "Minimal", "asset": "BTC", "metrics": []}
+    config_path = tmp_path / "minimal.json"
+    config_path.write_text(json.dumps(minimal_config))
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(minimal_config, f)
-        temp_path = f.name
+    dashboard = build_dashboard_from_file(config_path)
+    assert dashboard.meta.name == "Minimal"
+    assert len(dashboard.configs) == 0
 
-    try:
-        dashboard = build_dashboard_from_file(temp_path)
-        assert dashboard.meta.name == "Minimal"
-        assert len(dashboard.configs) == 0
-    finally:
-        Path(temp_path).unlink()
+    # Edge case - file changed between builds is re-read
+    config_path = tmp_path / "changed.json"
+    config_path.write_text(json.dumps({"name": "Before", "asset": "BTC", "metrics": []}))
+
+    assert build_dashboard_from_file(config_path).meta.name == "Before"
+    config_path.write_text(json.dumps({"name": "After", "asset": "BTC", "metrics": []}))
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert build_dashboard_from_file(config_path).meta.name == "After"
 
     # Failing case - file not found
-    try:
-        build_dashboard_from_file("nonexistent.json")
-        assert False, "Should raise FileNotFoundError"
-    except FileNotFoundError:
-        pass
+    with pytest.raises(FileNotFoundError):
+        build_dashboard_from_file(tmp_path / "nonexistent.json")
 
     # Failing case - invalid JSON
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        f.write("{'invalid': json, }")
-        temp_path = f.name
-
-    try:
-        build_dashboard_from_file(temp_path)
-        assert False, "Should raise JSONDecodeError"
-    except json.JSONDecodeError:
-        pass
-    finally:
-        Path(temp_path).unlink()
+    config_path = tmp_path / "invalid.json"
+    config_path.write_text("{'invalid': json, }")
+
+    with pytest.raises(json.JSONDecodeError):
+        build_dashboard_from_file(config_path)
 
     # Failing case - missing required fields
     invalid_config = {
@@ -320,18 +359,88 @@ def test_build_dashboard_from_file():
         "metrics": ["market.Price"],
         # Missing 'name'!
     }
+    config_path = tmp_path / "missing_name.json"
+    config_path.write_text(json.dumps(invalid_config))
+
+    with pytest.raises((KeyError, TypeError)):
+        build_dashboard_from_file(config_path)
+
+    # Failing case - metrics is not a list
+    config_path = tmp_path / "bad_metrics.json"
+    config_path.write_text(json.dumps({"name": "Bad Metrics", "asset": "BTC", "metrics": "market.Price"}))
+
+    with pytest.raises(TypeError, match="metrics"):
+        build_dashboard_from_file(config_path)
+
+
+def test_build_dashboard_from_json():
+    """Test building dashboards from in-memory JSON specifications"""
+    spec = {
+        "name": "In Memory",
+        "asset": "BTC",
+        "dashboardOverrides": {"resolution": "1h"},
+        "metrics": ["market.PriceUsdClose", {"code": "market.MvrvZScore", "asset": "ETH"}],
+    }
+
+    # Expected use - text, bytes and parsed dict give the same dashboard
+    for data in (json.dumps(spec), json.dumps(spec).encode(), spec):
+        dashboard = build_dashboard_from_json(data)
+        assert dashboard.meta.name == "In Memory"
+        assert len(dashboard.configs) == 2
+        assert dashboard.configs[0].meta.resolution == "1h"
+        assert dashboard.configs[1].meta.asset == "ETH"
+
+    # Failing case - invalid JSON
+    with pytest.raises(json.JSONDecodeError):
+        build_dashboard_from_json("{'invalid': json, }")
+
+    # Failing case - missing required fields
+    with pytest.raises(KeyError):
+        build_dashboard_from_json({"asset": "BTC", "metrics": []})
 
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(invalid_config, f)
-        temp_path = f.name
 
-    try:
-        build_dashboard_from_file(temp_path)
-        assert False, "Should require name field"
-    except (KeyError, TypeError):
-        pass
-    finally:
-        Path(temp_path).unlink()
+INVALID_SPEC_CASES = [
+    # Failing case - specification is not a JSON object
+    (["market.PriceUsdClose"], "must be a JSON object"),
+    # Failing case - required fields with the wrong type
+    ({"name": 1, "metrics": []}, "'name' must be of type str"),
+    ({"name": "Bad", "metrics": "market.PriceUsdClose"}, "'metrics' must be of type list"),
+    # Failing case - optional fields with the wrong type
+    ({"name": "Bad", "metrics": [], "asset": ["BTC"]}, "'asset' must be of type str"),
+    ({"name": "Bad", "metrics": [], "dashboardOverrides": ["1h"]}, "'dashboardOverrides' must be of type dict"),
+    ({"name": "Bad", "metrics": [], "common_overrides": "1h"}, "'common_overrides' must be of type dict"),
+]
+
+
+@pytest.mark.parametrize("spec,message", INVALID_SPEC_CASES)
+def test_build_dashboard_rejects_invalid_spec(spec, message):
+    """Test that specification fields of the wrong type are rejected"""
+    with pytest.raises(TypeError, match=message):
+        build_dashboard_from_json(json.dumps(spec))
+
+
+INVALID_OVERRIDE_CASES = [
+    # Failing case - value outside the allowed literals
+    {"chartStyle": "bar"},
+    # Failing case - wrong type for a string field
+    {"zoom": 5},
+    # Failing case - non-numeric timestamp
+    {"date": "yesterday"},
+]
+
+
+@pytest.mark.parametrize("override", INVALID_OVERRIDE_CASES)
+def test_build_dashboard_rejects_invalid_overrides(tmp_path, override):
+    """Test that user-supplied overrides are validated on both spec paths"""
+    spec = {"name": "Invalid", "asset": "BTC", "metrics": [{"code": "market.PriceUsdClose", **override}]}
+
+    with pytest.raises(ValidationError):
+        build_dashboard_from_json(spec)
+
+    spec_file = tmp_path / "invalid.json"
+    spec_file.write_text(json.dumps(spec))
+    with pytest.raises(ValidationError):
+        build_dashboard_from_file(spec_file)
 
 
 def test_build_dashboards_from_directory():
@@ -421,27 +530,18 @@ def test_build_dashboards_from_directory():
         assert list(dashboards.values())[0].meta.name == "Valid Dashboard"
 
     # Failing case - directory doesn't exist
-    try:
+    with pytest.raises(ValueError, match="Not a directory"):
         build_dashboards_from_directory("/nonexistent/directory")
-        assert False, "Should raise ValueError for non-existent directory"
-    except ValueError as e:
-        assert "Not a directory" in str(e)
 
     # Failing case - not a directory (file instead)
     with tempfile.NamedTemporaryFile(suffix=".json") as f:
-        try:
+        with pytest.raises(ValueError, match="Not a directory"):
             build_dashboards_from_directory(f.name)
-            assert False, "Should raise ValueError for file instead of directory"
-        except ValueError as e:
-            assert "Not a directory" in str(e)
 
     # Failing case - empty directory (no JSON files)
     with tempfile.TemporaryDirectory() as temp_dir:
-        try:
+        with pytest.raises(ValueError, match="No JSON files found"):
             build_dashboards_from_directory(temp_dir)
-            assert False, "Should raise ValueError for empty directory"
-        except ValueError as e:
-            assert "No JSON files found" in str(e)
 
     # Failing case - directory with only non-matching files
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -449,17 +549,54 @@ def test_build_dashboards_from_directory():
         (temp_path / "data.yaml").write_text("yaml: content")
         (temp_path / "config.toml").write_text("[config]")
 
-        try:
+        with pytest.raises(ValueError, match="No JSON files found"):
             build_dashboards_from_directory(temp_dir)
-            assert False, "Should raise ValueError when no JSON files found"
-        except ValueError as e:
-            assert "No JSON files found" in str(e)
-
-
-if __name__ == "__main__":
-    test_build_metric_config()
-    test_generate_layout()
-    test_build_dashboard()
-    test_build_dashboard_from_file()
-    test_build_dashboards_from_directory()
-    print("All dashboard_builder tests passed!")
+
+
+def test_build_dashboards_from_directory_symlink_loop(tmp_path):
+    """Test that a symlink looping back to its parent directory is not followed"""
+    config = {"name": "Nested Dashboard", "asset": "BTC", "metrics": ["market.Price"]}
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (nested / "dash.json").write_text(json.dumps(config))
+    (nested / "loop").symlink_to(tmp_path, target_is_directory=True)
+
+    dashboards = build_dashboards_from_directory(tmp_path)
+
+    assert list(dashboards) == [nested / "dash.json"]
+
+
+def test_build_dashboards_from_directory_skips_unreadable(tmp_path, monkeypatch):
+    """Test that a subdirectory that can't be listed is skipped instead of aborting the build"""
+    config = {"name": "Readable Dashboard", "asset": "BTC", "metrics": ["market.Price"]}
+    (tmp_path / "readable.json").write_text(json.dumps(config))
+    locked = tmp_path / "locked"
+    locked.mkdir()
+    (locked / "hidden.json").write_text(json.dumps(config))
+
+    # Permission bits don't stop root, so refuse the listing directly
+    scandir = os.scandir
+
+    def guarded_scandir(path):
+        if Path(path) == locked:
+            raise PermissionError(13, "Permission denied", str(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", guarded_scandir)
+
+    dashboards = build_dashboards_from_directory(tmp_path)
+
+    assert list(dashboards) == [tmp_path / "readable.json"]
+
+
+def test_build_dashboards_from_directory_nested_pattern(tmp_path):
+    """Test that a pattern containing a path separator matches relative to the directory"""
+    config = {"name": "Sub Dashboard", "asset": "BTC", "metrics": ["market.Price"]}
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / "a.json").write_text(json.dumps(config))
+    (tmp_path / "top.json").write_text(json.dumps(config))
+
+    dashboards = build_dashboards_from_directory(tmp_path, pattern="sub/*.json")
+
+    assert list(dashboards) == [sub / "a.json"]
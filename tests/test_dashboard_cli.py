@@ -1,49 +1,110 @@
 """Tests for dashboard CLI with focus on UUID mapping edge cases"""
 
-import os
 import sys
+import importlib.machinery
+import importlib.util
+import io
+from argparse import Namespace
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
+from types import SimpleNamespace
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 # Import the functions we'll test by mocking dependencies first
-from unittest.mock import MagicMock, Mock, patch, mock_open
+from unittest.mock import MagicMock, patch
 
 # Create mock modules for the dashboard script
 mock_dashboard_client = MagicMock()
+mock_dashboard_client.MAPPINGS_FILE = ".dashboard_mappings.json"
 mock_dashboard_builder = MagicMock()
 
-# Execute the dashboard file with mocked dependencies
-dashboard_globals = {
-    "__name__": "dashboard",
-    "dashboard_client": mock_dashboard_client,
-    "dashboard_builder": mock_dashboard_builder,
-    "create_dashboard": mock_dashboard_client.create_dashboard,
-    "update_dashboard": mock_dashboard_client.update_dashboard,
-    "create_dashboards": mock_dashboard_client.create_dashboards,
-    "update_dashboards": mock_dashboard_client.update_dashboards,
-    "create_or_update_dashboard": mock_dashboard_client.create_or_update_dashboard,
-    "load_mappings": mock_dashboard_client.load_mappings,
-    "save_mapping": mock_dashboard_client.save_mapping,
-    "MAPPINGS_FILE": ".dashboard_mappings.json",
-    "build_dashboard_from_file": mock_dashboard_builder.build_dashboard_from_file,
-    "build_dashboards_from_directory": mock_dashboard_builder.build_dashboards_from_directory,
-}
-
+# Load the dash script as a module with its dependencies mocked. It has no .py suffix, so the
+# source loader is named explicitly; the module name keeps the __main__ block from running.
 dashboard_path = Path(__file__).parent.parent / "dash"
-with open(dashboard_path, "r") as f:
-    dashboard_code = f.read()
-    # Prevent main from running and adjust imports
-    dashboard_code = dashboard_code.replace('if __name__ == "__main__":', "if False:")
-    dashboard_code = dashboard_code.replace(
-        "from dashboard_builder import build_dashboard_from_file, build_dashboards_from_directory", ""
-    )
-    dashboard_code = dashboard_code.replace(
-        "from dashboard_client import (\n    create_dashboard, update_dashboard, create_dashboards, update_dashboards,\n    create_or_update_dashboard, load_mappings, save_mapping, MAPPINGS_FILE\n)",
-        "",
-    )
-    exec(dashboard_code, dashboard_globals)
+_loader = importlib.machinery.SourceFileLoader("dash", str(dashboard_path))
+dash_module = importlib.util.module_from_spec(importlib.util.spec_from_loader("dash", _loader))
+with patch.dict(sys.modules, {"dashboard_client": mock_dashboard_client, "dashboard_builder": mock_dashboard_builder}):
+    _loader.exec_module(dash_module)
+
+# The tests configure the mocked dependencies through the module's namespace
+dashboard_globals = vars(dash_module)
+
+
+def _mock_response(status_code, payload=None):
+    """API response stand-in with the given status code and JSON body"""
+    body = {} if payload is None else payload
+    return SimpleNamespace(status_code=status_code, json=lambda: body)
+
+
+@dataclass(slots=True)
+class _StubDashboard:
+    """Built dashboard stand-in exposing only what the CLI prints and writes"""
+
+    meta: SimpleNamespace
+    configs: list
+    _dump: str
+
+    def model_dump_json(self, **kwargs) -> str:
+        return self._dump
+
+
+def _mock_dashboard(name="Test Dashboard", metric_count=2, data='{"test": "data"}'):
+    """Built dashboard with the given name, number of metrics and serialized form"""
+    return _StubDashboard(meta=SimpleNamespace(name=name), configs=[None] * metric_count, _dump=data)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_dependency_mocks():
+    """Start every test from unconfigured dependency mocks so no test sees another's setup"""
+    for module in (mock_dashboard_client, mock_dashboard_builder):
+        module.reset_mock(return_value=True, side_effect=True)
+
+
+@contextmanager
+def _side_effect(mock, exc):
+    """Make ``mock`` raise ``exc`` for the duration of the block"""
+    mock.side_effect = exc
+    try:
+        yield
+    finally:
+        mock.side_effect = None
+
+
+class _RecordedFile(io.StringIO):
+    """In-memory file that hands its contents to ``sink`` under ``path`` when closed"""
+
+    def __init__(self, sink, path):
+        super().__init__()
+        self._sink = sink
+        self._path = path
+
+    def close(self):
+        if not self.closed:
+            self._sink[self._path] = self.getvalue()
+        super().close()
+
+
+class _RecordingOpen:
+    """Stand-in for builtins.open that keeps everything written, keyed by path"""
+
+    def __init__(self):
+        self.written = {}
+
+    def __call__(self, file, mode="r", *args, **kwargs):
+        return _RecordedFile(self.written, str(file))
+
+
+@pytest.fixture
+def io_mocks(monkeypatch):
+    """Replace file writes and directory creation for a test; yields the (open, mkdir) stand-ins"""
+    fake_open = _RecordingOpen()
+    mkdir_mock = MagicMock()
+    monkeypatch.setattr("builtins.open", fake_open)
+    monkeypatch.setattr(Path, "mkdir", mkdir_mock)
+    yield fake_open, mkdir_mock
+
 
 # Extract functions we need to test
 cmd_build = dashboard_globals["cmd_build"]
@@ -55,124 +116,123 @@ dashboard_to_config_path = dashboard_globals["dashboard_to_config_path"]
 build_and_save_dashboard = dashboard_globals["build_and_save_dashboard"]
 
 
-def test_path_conversions():
-    """Test path conversion utility functions"""
-    # Test config to dashboard path
-    assert config_to_dashboard_path("configs/test.json") == Path("dashboards/test_dashboard.json")
-    assert config_to_dashboard_path("configs/examples/test.json") == Path("dashboards/examples/test_dashboard.json")
-    assert config_to_dashboard_path("configs/sub/dir/test.json") == Path("dashboards/sub/dir/test_dashboard.json")
+# Paths shared by the tests below
+_P_DASH_TEST = Path("dashboards/test_dashboard.json")
+_P_CFG_EX = Path("configs/examples")
+_P_CFG_EX_1 = Path("configs/examples/dash1.json")
+_P_CFG_EX_2 = Path("configs/examples/dash2.json")
+_P_DASH_EX = Path("dashboards/examples")
+_P_DASH_EX_1 = Path("dashboards/examples/dash1.json")
+_P_DASH_EX_2 = Path("dashboards/examples/dash2.json")
+_P_DASH_1 = Path("dashboards/dash1.json")
+_P_DASH_2 = Path("dashboards/dash2.json")
 
-    # Test dashboard to config path
-    assert dashboard_to_config_path("dashboards/test_dashboard.json") == "configs/test.json"
-    assert dashboard_to_config_path("dashboards/examples/test_dashboard.json") == "configs/examples/test.json"
-    assert dashboard_to_config_path("dashboards/sub/dir/test_dashboard.json") == "configs/sub/dir/test.json"
+# Reusable patchers making every path look like a directory (or not); a patcher can be entered again once exited
+_AS_DIR = patch.object(Path, "is_dir", return_value=True)
+_AS_FILE = patch.object(Path, "is_dir", return_value=False)
 
-    # Test round-trip conversion
-    config_path = "configs/examples/complex_name.json"
-    dashboard_path = config_to_dashboard_path(config_path)
-    assert dashboard_to_config_path(dashboard_path) == config_path
 
+CONFIG_TO_DASHBOARD_PATHS = [
+    ("configs/test.json", Path("dashboards/test_dashboard.json")),
+    ("configs/examples/test.json", Path("dashboards/examples/test_dashboard.json")),
+    ("configs/sub/dir/test.json", Path("dashboards/sub/dir/test_dashboard.json")),
+]
 
-def test_load_mappings():
-    """Test loading UUID mappings - now delegates to dashboard_client"""
-    # The load_mappings is now imported from dashboard_client, so we just verify it's a mock
-    assert hasattr(dashboard_globals["load_mappings"], "return_value"), "load_mappings should be a mock"
+DASHBOARD_TO_CONFIG_PATHS = [
+    ("dashboards/test_dashboard.json", "configs/test.json"),
+    ("dashboards/examples/test_dashboard.json", "configs/examples/test.json"),
+    ("dashboards/sub/dir/test_dashboard.json", "configs/sub/dir/test.json"),
+    # Only the trailing suffix is stripped
+    ("dashboards/my_dashboard_stats_dashboard.json", "configs/my_dashboard_stats.json"),
+    ("dashboards/plain.json", "configs/plain.json"),
+]
 
 
-def test_save_mapping():
-    """Test saving UUID mappings - now delegates to dashboard_client"""
-    # The save_mapping is now imported from dashboard_client, so we just verify it's a mock
-    assert hasattr(dashboard_globals["save_mapping"], "assert_called_with"), "save_mapping should be a mock"
+@pytest.mark.parametrize("config_path,dashboard_path", CONFIG_TO_DASHBOARD_PATHS)
+def test_config_to_dashboard_path(config_path, dashboard_path):
+    """Test config to dashboard path conversion"""
+    assert config_to_dashboard_path(config_path) == dashboard_path
 
 
-def test_build_and_save_dashboard():
-    """Test the build_and_save_dashboard utility function"""
-    # Mock dashboard
-    mock_dashboard = Mock()
-    mock_dashboard.meta.name = "Test Dashboard"
-    mock_dashboard.configs = [Mock(), Mock()]
-    mock_dashboard.model_dump.return_value = {"test": "data"}
-    dashboard_globals["build_dashboard_from_file"].return_value = mock_dashboard
+@pytest.mark.parametrize("dashboard_path,config_path", DASHBOARD_TO_CONFIG_PATHS)
+def test_dashboard_to_config_path(dashboard_path, config_path):
+    """Test dashboard to config path conversion"""
+    assert dashboard_to_config_path(dashboard_path) == config_path
 
-    with patch("builtins.open", mock_open()) as mock_file, patch("pathlib.Path.mkdir"):
-        # Test the function
-        output_path, dashboard = build_and_save_dashboard("configs/test.json")
 
-        # Verify output path is correct
-        assert output_path == Path("dashboards/test_dashboard.json")
+def test_path_round_trip():
+    """Test round-trip conversion"""
+    config_path = "configs/examples/complex_dashboard_name.json"
+    dashboard_path = config_to_dashboard_path(config_path)
+    assert dashboard_to_config_path(dashboard_path) == config_path
 
-        # Verify dashboard was returned
-        assert dashboard == mock_dashboard
 
-        # Verify file was written
-        mock_file.assert_called()
-        write_calls = mock_file().write.call_args_list
-        assert len(write_calls) > 0
+@pytest.mark.parametrize("name", ["load_mappings", "save_mapping"])
+def test_mappings_delegate_to_client(name):
+    """Mapping persistence is imported from dashboard_client rather than reimplemented in the CLI"""
+    assert dashboard_globals[name] is getattr(mock_dashboard_client, name)
 
 
-def test_cmd_create():
-    """Test create command with UUID mapping"""
-    # Expected use - successful create with mapping
-    mock_response = Mock()
-    mock_response.status_code = 201
-    mock_response.json.return_value = {"uuid": "created-uuid-123"}
+def test_build_and_save_dashboard(io_mocks):
+    """Test the build_and_save_dashboard utility function"""
+    # Mock dashboard
+    mock_dashboard = _mock_dashboard()
+    dashboard_globals["build_dashboard_from_file"].return_value = mock_dashboard
 
-    dashboard_globals["create_or_update_dashboard"].return_value = mock_response
+    mock_file, _ = io_mocks
 
-    # Mock save_mapping
-    dashboard_globals["save_mapping"].reset_mock()
+    # Test the function
+    output_path, dashboard = build_and_save_dashboard("configs/test.json")
 
-    args = Mock()
-    args.file = "dashboards/test_dashboard.json"
+    # Verify output path is correct
+    assert output_path == _P_DASH_TEST
 
-    cmd_create(args)
+    # Verify dashboard was returned
+    assert dashboard == mock_dashboard
 
-    # Verify mapping was saved
-    dashboard_globals["save_mapping"].assert_called_once_with("configs/test.json", "created-uuid-123")
+    # Verify file was written
+    assert mock_file.written == {str(_P_DASH_TEST): '{"test": "data"}'}
 
-    # Edge case - no UUID in response
-    mock_response = Mock()
-    mock_response.status_code = 201
-    mock_response.json.return_value = {}  # No UUID
 
-    dashboard_globals["create_or_update_dashboard"].return_value = mock_response
-    dashboard_globals["save_mapping"].reset_mock()
+CREATE_MAPPING_CASES = [
+    # Expected use - successful create with mapping
+    ({"uuid": "created-uuid-123"}, ("configs/test.json", "created-uuid-123")),
+    # Edge case - no UUID in response, so nothing to map
+    ({}, None),
+]
+
 
-    args = Mock()
-    args.file = "dashboards/test_dashboard.json"
+@pytest.mark.parametrize("payload,expected_mapping", CREATE_MAPPING_CASES)
+def test_cmd_create(payload, expected_mapping):
+    """Test create command with UUID mapping"""
+    dashboard_globals["create_or_update_dashboard"].return_value = _mock_response(201, payload)
+
+    args = Namespace(file="dashboards/test_dashboard.json")
 
     cmd_create(args)
 
-    # Mapping should NOT be saved
-    dashboard_globals["save_mapping"].assert_not_called()
+    if expected_mapping:
+        dashboard_globals["save_mapping"].assert_called_once_with(*expected_mapping)
+    else:
+        dashboard_globals["save_mapping"].assert_not_called()
 
-    # Failing case - API error
-    dashboard_globals["create_or_update_dashboard"].side_effect = Exception("API Error")
 
-    args = Mock()
-    args.file = "dashboard.json"
+def test_cmd_create_api_error():
+    """Test create command exits when the API call fails"""
+    args = Namespace(file="dashboard.json")
 
-    try:
+    api_error = Exception("API Error")
+    with _side_effect(dashboard_globals["create_or_update_dashboard"], api_error), pytest.raises(SystemExit):
         cmd_create(args)
-        assert False, "Should have raised SystemExit"
-    except SystemExit:
-        pass
-    finally:
-        dashboard_globals["create_or_update_dashboard"].side_effect = None
 
 
 def test_cmd_update_with_uuid():
     """Test update command with explicit UUID"""
     # Expected use - update with UUID and save mapping
-    mock_response = Mock()
-    mock_response.status_code = 200
+    mock_response = _mock_response(200)
     dashboard_globals["update_dashboard"].return_value = mock_response
 
-    dashboard_globals["save_mapping"].reset_mock()
-
-    args = Mock()
-    args.uuid = "explicit-uuid-123"
-    args.file = "dashboards/test_dashboard.json"
+    args = Namespace(uuid="explicit-uuid-123", file="dashboards/test_dashboard.json")
 
     cmd_update(args)
 
@@ -180,27 +240,20 @@ def test_cmd_update_with_uuid():
     dashboard_globals["save_mapping"].assert_called_once_with("configs/test.json", "explicit-uuid-123")
 
 
-def test_cmd_update_with_config():
+def test_cmd_update_with_config(io_mocks):
     """Test update command with config path (UUID lookup)"""
     # Mock load_mappings to return test data
     dashboard_globals["load_mappings"].return_value = {"configs/test.json": "mapped-uuid-123"}
 
     # Mock dashboard build
-    mock_dashboard = Mock()
-    mock_dashboard.model_dump.return_value = {"test": "data"}
+    mock_dashboard = _mock_dashboard()
     dashboard_globals["build_dashboard_from_file"].return_value = mock_dashboard
 
     # Mock update response
-    mock_response = Mock()
-    mock_response.status_code = 200
+    mock_response = _mock_response(200)
     dashboard_globals["update_dashboard"].return_value = mock_response
 
-    args = Mock()
-    args.uuid = "configs/test.json"  # Config path instead of UUID
-    args.file = None
-
-    # Ensure dashboards directory exists
-    os.makedirs("dashboards", exist_ok=True)
+    args = Namespace(uuid="configs/test.json", file=None)  # Config path instead of UUID
 
     cmd_update(args)
 
@@ -208,71 +261,44 @@ def test_cmd_update_with_config():
     call_args = dashboard_globals["update_dashboard"].call_args[0]
     assert call_args[0] == "mapped-uuid-123"
 
-    # Clean up the created dashboard file
-    dashboard_file = Path("dashboards/test_dashboard.json")
-    if dashboard_file.exists():
-        dashboard_file.unlink()
-
     # Edge case - config not in mappings
     dashboard_globals["load_mappings"].return_value = {}
 
-    args = Mock()
-    args.uuid = "configs/unmapped.json"
-    args.file = None
+    args = Namespace(uuid="configs/unmapped.json", file=None)
 
-    try:
+    with pytest.raises(SystemExit):
         cmd_update(args)
-        assert False, "Should have raised SystemExit"
-    except SystemExit:
-        pass
 
 
-def test_cmd_build():
+def test_cmd_build(tmp_path, monkeypatch):
     """Test build command"""
-    # Expected use
-    mock_dashboard = Mock()
-    mock_dashboard.meta.name = "Test Dashboard"
-    mock_dashboard.configs = [Mock(), Mock()]
-    mock_dashboard.model_dump.return_value = {"test": "data"}
+    # Expected use - the dashboard is written for real under a throwaway working directory
+    monkeypatch.chdir(tmp_path)
+    mock_dashboard = _mock_dashboard()
     dashboard_globals["build_dashboard_from_file"].return_value = mock_dashboard
 
-    args = Mock()
-    args.config = "configs/test.json"
+    args = Namespace(config="configs/test.json")
 
-    with patch("builtins.open", mock_open()) as mock_file, patch("pathlib.Path.mkdir"):
-        cmd_build(args)
+    cmd_build(args)
 
-        # Verify file was written
-        mock_file.assert_called()
-        write_calls = mock_file().write.call_args_list
-        written_data = "".join(str(call[0][0]) for call in write_calls)
-        assert "test" in written_data
+    # Verify file was written
+    assert (tmp_path / _P_DASH_TEST).read_text() == '{"test": "data"}'
 
     # Failing case - build error
-    dashboard_globals["build_dashboard_from_file"].side_effect = FileNotFoundError("Config not found")
-
-    args = Mock()
-    args.config = "missing.json"
+    args = Namespace(config="missing.json")
 
-    try:
+    build_error = FileNotFoundError("Config not found")
+    with _side_effect(dashboard_globals["build_dashboard_from_file"], build_error), pytest.raises(SystemExit):
         cmd_build(args)
-        assert False, "Should have raised SystemExit"
-    except SystemExit:
-        pass
-    finally:
-        dashboard_globals["build_dashboard_from_file"].side_effect = None
 
 
 def test_mapping_edge_cases():
     """Test specific edge cases from our discussion"""
     # Test that create_or_update_dashboard is used and mappings are saved
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"uuid": "some-uuid"}
+    mock_response = _mock_response(200, {"uuid": "some-uuid"})
     dashboard_globals["create_or_update_dashboard"].return_value = mock_response
 
-    args = Mock()
-    args.file = "dashboards/test_dashboard.json"
+    args = Namespace(file="dashboards/test_dashboard.json")
 
     cmd_create(args)
 
@@ -282,13 +308,10 @@ def test_mapping_edge_cases():
     # Test 2: Update with different UUID updates mapping
     dashboard_globals["save_mapping"].reset_mock()
 
-    mock_response = Mock()
-    mock_response.status_code = 200
+    mock_response = _mock_response(200)
     dashboard_globals["update_dashboard"].return_value = mock_response
 
-    args = Mock()
-    args.uuid = "uuid-2"  # Different UUID
-    args.file = "dashboards/test_dashboard.json"
+    args = Namespace(uuid="uuid-2", file="dashboards/test_dashboard.json")  # Different UUID
 
     cmd_update(args)
 
@@ -296,132 +319,107 @@ def test_mapping_edge_cases():
     dashboard_globals["save_mapping"].assert_called_with("configs/test.json", "uuid-2")
 
 
-def test_cmd_build_batch():
+def test_cmd_build_batch(io_mocks):
     """Test batch build command for directories"""
     # Expected use - build multiple dashboards from directory
     mock_dashboards = {
-        Path("configs/examples/dash1.json"): Mock(
-            meta=Mock(name="Dashboard 1"), configs=[Mock()], model_dump=Mock(return_value={"name": "Dashboard 1"})
-        ),
-        Path("configs/examples/dash2.json"): Mock(
-            meta=Mock(name="Dashboard 2"),
-            configs=[Mock(), Mock()],
-            model_dump=Mock(return_value={"name": "Dashboard 2"}),
-        ),
+        _P_CFG_EX_1: _mock_dashboard("Dashboard 1", 1, '{"name": "Dashboard 1"}'),
+        _P_CFG_EX_2: _mock_dashboard("Dashboard 2", 2, '{"name": "Dashboard 2"}'),
     }
 
     dashboard_globals["build_dashboards_from_directory"].return_value = mock_dashboards
 
-    args = Mock()
-    args.config = "configs/examples"
+    args = Namespace(config="configs/examples")
 
     # Mock Path.is_dir to return True
-    with (
-        patch("pathlib.Path.is_dir", return_value=True),
-        patch("pathlib.Path.mkdir"),
-        patch("builtins.open", mock_open()),
-    ):
+    with _AS_DIR:
         cmd_build(args)
 
         # Verify build_dashboards_from_directory was called
-        dashboard_globals["build_dashboards_from_directory"].assert_called_once_with(Path("configs/examples"))
+        dashboard_globals["build_dashboards_from_directory"].assert_called_once_with(_P_CFG_EX)
 
     # Edge case - empty directory (no dashboards built)
     dashboard_globals["build_dashboards_from_directory"].return_value = {}
 
-    with patch("pathlib.Path.is_dir", return_value=True):
+    with _AS_DIR:
         cmd_build(args)
         # Should complete without error, print 0 dashboards built
 
     # Failing case - directory doesn't exist
-    dashboard_globals["build_dashboards_from_directory"].side_effect = ValueError("Not a directory")
-
-    with patch("pathlib.Path.is_dir", return_value=True):
-        try:
-            cmd_build(args)
-            assert False, "Should have raised SystemExit"
-        except SystemExit:
-            pass
-
-    dashboard_globals["build_dashboards_from_directory"].side_effect = None
+    with (
+        _side_effect(dashboard_globals["build_dashboards_from_directory"], ValueError("Not a directory")),
+        _AS_DIR,
+        pytest.raises(SystemExit),
+    ):
+        cmd_build(args)
 
 
-def test_cmd_create_batch():
+def test_cmd_create_batch(io_mocks):
     """Test batch create command for directories"""
     # Expected use - create multiple dashboards
     mock_responses = {
-        Path("dashboards/examples/dash1.json"): Mock(status_code=200, json=Mock(return_value={"uuid": "uuid-1"})),
-        Path("dashboards/examples/dash2.json"): Mock(status_code=200, json=Mock(return_value={"uuid": "uuid-2"})),
+        _P_DASH_EX_1: _mock_response(200, {"uuid": "uuid-1"}),
+        _P_DASH_EX_2: _mock_response(200, {"uuid": "uuid-2"}),
     }
 
     dashboard_globals["create_dashboards"].return_value = mock_responses
     dashboard_globals["load_mappings"].return_value = {}
 
-    args = Mock()
-    args.file = "dashboards/examples"
+    args = Namespace(file="dashboards/examples")
 
-    with patch("pathlib.Path.is_dir", return_value=True), patch("builtins.open", mock_open(read_data="{}")):
+    with _AS_DIR:
         cmd_create(args)
 
         # Verify create_dashboards was called
-        dashboard_globals["create_dashboards"].assert_called_once_with(Path("dashboards/examples"))
+        dashboard_globals["create_dashboards"].assert_called_once_with(_P_DASH_EX)
 
     # Edge case - some creates fail
     mock_responses_with_failures = {
-        Path("dashboards/dash1.json"): Mock(status_code=200, json=Mock(return_value={"uuid": "uuid-1"})),
-        Path("dashboards/dash2.json"): Mock(status_code=500, json=Mock(return_value={"error": "Server error"})),
-        Path("dashboards/dash3.json"): Mock(status_code=200, json=Mock(return_value={"uuid": "uuid-3"})),
+        _P_DASH_1: _mock_response(200, {"uuid": "uuid-1"}),
+        _P_DASH_2: _mock_response(500, {"error": "Server error"}),
+        Path("dashboards/dash3.json"): _mock_response(200, {"uuid": "uuid-3"}),
     }
 
     dashboard_globals["create_dashboards"].return_value = mock_responses_with_failures
     dashboard_globals["load_mappings"].return_value = {}
 
-    with patch("pathlib.Path.is_dir", return_value=True), patch("builtins.open", mock_open(read_data="{}")):
+    with _AS_DIR:
         cmd_create(args)
         # Should handle partial failures gracefully
 
     # Failing case - API error
-    dashboard_globals["create_dashboards"].side_effect = Exception("Network error")
-
-    with patch("pathlib.Path.is_dir", return_value=True):
-        try:
-            cmd_create(args)
-            assert False, "Should have raised SystemExit"
-        except SystemExit:
-            pass
-
-    dashboard_globals["create_dashboards"].side_effect = None
+    with (
+        _side_effect(dashboard_globals["create_dashboards"], Exception("Network error")),
+        _AS_DIR,
+        pytest.raises(SystemExit),
+    ):
+        cmd_create(args)
 
 
-def test_cmd_update_batch():
+def test_cmd_update_batch(io_mocks):
     """Test batch update command for directories"""
     # Expected use - update from configs directory
     mock_dashboards = {
-        Path("configs/examples/dash1.json"): Mock(model_dump=Mock(return_value={"name": "Dashboard 1"})),
-        Path("configs/examples/dash2.json"): Mock(model_dump=Mock(return_value={"name": "Dashboard 2"})),
+        _P_CFG_EX_1: _mock_dashboard("Dashboard 1", data='{"name": "Dashboard 1"}'),
+        _P_CFG_EX_2: _mock_dashboard("Dashboard 2", data='{"name": "Dashboard 2"}'),
     }
 
     mock_update_responses = {
-        "uuid-1": Mock(status_code=200),
-        "uuid-2": Mock(status_code=200),
+        "uuid-1": _mock_response(200),
+        "uuid-2": _mock_response(200),
     }
 
     dashboard_globals["build_dashboards_from_directory"].return_value = mock_dashboards
+    # Each config is rebuilt and saved before the upload
+    dashboard_globals["build_dashboard_from_file"].return_value = _mock_dashboard()
     dashboard_globals["update_dashboards"].return_value = mock_update_responses
 
-    args = Mock()
-    args.uuid = "configs/examples"
-    args.file = None
+    args = Namespace(uuid="configs/examples", file=None)
 
-    with (
-        patch("pathlib.Path.is_dir", return_value=True),
-        patch("pathlib.Path.mkdir"),
-        patch("builtins.open", mock_open(read_data="{}")),
-    ):
+    with _AS_DIR:
         cmd_update(args)
 
         # Verify both build and update were called
-        # Reset call count since this is not the first test
         assert dashboard_globals["build_dashboards_from_directory"].called
         assert dashboard_globals["update_dashboards"].called
 
@@ -431,93 +429,69 @@ def test_cmd_update_batch():
 
     args.uuid = "dashboards/examples"
 
-    with patch("pathlib.Path.is_dir", return_value=True):
+    with _AS_DIR:
         cmd_update(args)
 
         # Should not build, just update
         dashboard_globals["build_dashboards_from_directory"].assert_not_called()
-        dashboard_globals["update_dashboards"].assert_called_once_with(Path("dashboards/examples"))
+        dashboard_globals["update_dashboards"].assert_called_once_with(_P_DASH_EX)
 
     # Edge case - some updates fail
     mock_update_responses_with_failures = {
-        "uuid-1": Mock(status_code=200),
-        "uuid-2": Mock(status_code=500),
-        "uuid-3": Mock(status_code=200),
+        "uuid-1": _mock_response(200),
+        "uuid-2": _mock_response(500),
+        "uuid-3": _mock_response(200),
     }
 
     dashboard_globals["update_dashboards"].return_value = mock_update_responses_with_failures
 
-    with patch("pathlib.Path.is_dir", return_value=True):
+    with _AS_DIR:
         cmd_update(args)
         # Should handle partial failures
 
     # Failing case - no mappings found
-    dashboard_globals["update_dashboards"].side_effect = ValueError("No mapped dashboards found")
-
-    with patch("pathlib.Path.is_dir", return_value=True):
-        try:
-            cmd_update(args)
-            assert False, "Should have raised SystemExit"
-        except SystemExit:
-            pass
-
-    dashboard_globals["update_dashboards"].side_effect = None
+    with (
+        _side_effect(dashboard_globals["update_dashboards"], ValueError("No mapped dashboards found")),
+        _AS_DIR,
+        pytest.raises(SystemExit),
+    ):
+        cmd_update(args)
 
 
-def test_directory_mirroring():
+def test_directory_mirroring(io_mocks):
     """Test that directory structure is preserved configs/ -> dashboards/"""
     # Test build preserves structure
-    mock_dashboard = Mock(
-        meta=Mock(name="Test Dashboard"), configs=[Mock()], model_dump=Mock(return_value={"test": "data"})
-    )
+    mock_dashboard = _mock_dashboard(metric_count=1)
     dashboard_globals["build_dashboard_from_file"].return_value = mock_dashboard
 
-    args = Mock()
-    args.config = "configs/examples/subdirectory/test.json"
+    args = Namespace(config="configs/examples/subdirectory/test.json")
 
-    with (
-        patch("pathlib.Path.is_dir", return_value=False),
-        patch("pathlib.Path.mkdir") as mock_mkdir,
-        patch("builtins.open", mock_open()) as mock_file,
-    ):
+    mock_file, mock_mkdir = io_mocks
+
+    with _AS_FILE:
         cmd_build(args)
 
         # Verify correct output path
-        expected_path = "dashboards/examples/subdirectory/test_dashboard.json"
-        calls = [str(call[0][0]) for call in mock_file.call_args_list if call[0]]
-        assert any(expected_path in call for call in calls)
+        expected_path = Path("dashboards/examples/subdirectory/test_dashboard.json")
+        assert str(expected_path) in mock_file.written
 
         # Verify directories were created with parents=True
         mock_mkdir.assert_called_with(parents=True, exist_ok=True)
 
 
-def test_cmd_run_single():
+def test_cmd_run_single(io_mocks):
     """Test run command for single file"""
-    # Reset mocks
-    dashboard_globals["build_dashboard_from_file"].reset_mock()
-    dashboard_globals["create_or_update_dashboard"].reset_mock()
-    dashboard_globals["save_mapping"].reset_mock()
-
     # Mock dashboard build
-    mock_dashboard = Mock(
-        meta=Mock(name="Test Dashboard"), configs=[Mock(), Mock()], model_dump=Mock(return_value={"test": "data"})
-    )
+    mock_dashboard = _mock_dashboard()
     dashboard_globals["build_dashboard_from_file"].return_value = mock_dashboard
 
     # Mock create_or_update response
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"uuid": "run-uuid-123"}
+    mock_response = _mock_response(200, {"uuid": "run-uuid-123"})
     dashboard_globals["create_or_update_dashboard"].return_value = mock_response
 
-    args = Mock()
-    args.config = "configs/test.json"
+    args = Namespace(config="configs/test.json")
 
-    with (
-        patch("pathlib.Path.is_dir", return_value=False),
-        patch("pathlib.Path.mkdir"),
-        patch("builtins.open", mock_open()),
-    ):
+    with _AS_FILE:
         cmd_run(args)
 
         # Verify build was called
@@ -530,81 +504,42 @@ def test_cmd_run_single():
         dashboard_globals["save_mapping"].assert_called_once_with("configs/test.json", "run-uuid-123")
 
 
-def test_cmd_run_batch():
+def test_cmd_run_batch(io_mocks):
     """Test run command for directory"""
-    # Reset mocks
-    dashboard_globals["build_dashboards_from_directory"].reset_mock()
-    dashboard_globals["create_dashboards"].reset_mock()
-    dashboard_globals["load_mappings"].reset_mock()
-
     # Mock dashboard builds
     mock_dashboards = {
-        Path("configs/examples/dash1.json"): Mock(
-            meta=Mock(name="Dashboard 1"), configs=[Mock()], model_dump=Mock(return_value={"name": "Dashboard 1"})
-        ),
-        Path("configs/examples/dash2.json"): Mock(
-            meta=Mock(name="Dashboard 2"),
-            configs=[Mock(), Mock()],
-            model_dump=Mock(return_value={"name": "Dashboard 2"}),
-        ),
+        _P_CFG_EX_1: _mock_dashboard("Dashboard 1", 1, '{"name": "Dashboard 1"}'),
+        _P_CFG_EX_2: _mock_dashboard("Dashboard 2", 2, '{"name": "Dashboard 2"}'),
     }
     dashboard_globals["build_dashboards_from_directory"].return_value = mock_dashboards
 
     # Mock create_dashboards responses
     mock_responses = {
-        Path("dashboards/examples/dash1.json"): Mock(status_code=200, json=Mock(return_value={"uuid": "uuid-1"})),
-        Path("dashboards/examples/dash2.json"): Mock(status_code=200, json=Mock(return_value={"uuid": "uuid-2"})),
+        _P_DASH_EX_1: _mock_response(200, {"uuid": "uuid-1"}),
+        _P_DASH_EX_2: _mock_response(200, {"uuid": "uuid-2"}),
     }
     dashboard_globals["create_dashboards"].return_value = mock_responses
     dashboard_globals["load_mappings"].return_value = {}
 
-    args = Mock()
-    args.config = "configs/examples"
+    args = Namespace(config="configs/examples")
 
-    with (
-        patch("pathlib.Path.is_dir", return_value=True),
-        patch("pathlib.Path.mkdir"),
-        patch("builtins.open", mock_open(read_data="{}")),
-    ):
+    with _AS_DIR:
         cmd_run(args)
 
         # Verify build was called
-        dashboard_globals["build_dashboards_from_directory"].assert_called_once_with(Path("configs/examples"))
+        dashboard_globals["build_dashboards_from_directory"].assert_called_once_with(_P_CFG_EX)
 
         # Verify deploy was called
         dashboard_globals["create_dashboards"].assert_called_once()
 
     # Test with some failures
     mock_responses_with_failures = {
-        Path("dashboards/dash1.json"): Mock(status_code=200, json=Mock(return_value={"uuid": "uuid-1"})),
-        Path("dashboards/dash2.json"): Mock(status_code=500, json=Mock(return_value={"error": "Server error"})),
+        _P_DASH_1: _mock_response(200, {"uuid": "uuid-1"}),
+        _P_DASH_2: _mock_response(500, {"error": "Server error"}),
     }
 
     dashboard_globals["create_dashboards"].return_value = mock_responses_with_failures
 
-    with (
-        patch("pathlib.Path.is_dir", return_value=True),
-        patch("pathlib.Path.mkdir"),
-        patch("builtins.open", mock_open(read_data="{}")),
-    ):
+    with _AS_DIR:
         cmd_run(args)
         # Should complete even with partial failures
-
-
-if __name__ == "__main__":
-    test_path_conversions()
-    test_load_mappings()
-    test_save_mapping()
-    test_build_and_save_dashboard()
-    test_cmd_create()
-    test_cmd_update_with_uuid()
-    test_cmd_update_with_config()
-    test_cmd_build()
-    test_mapping_edge_cases()
-    test_cmd_build_batch()
-    test_cmd_create_batch()
-    test_cmd_update_batch()
-    test_directory_mirroring()
-    test_cmd_run_single()
-    test_cmd_run_batch()
-    print("All dashboard CLI tests passed!")
@@ -1,187 +1,180 @@
 """Tests for dashboard_client.py"""
 
-import os
-import sys
 import json
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 from unittest import mock
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-# Import after setting env var
 from dashboard_client import (
     create_dashboard,
     update_dashboard,
     create_dashboards,
     update_dashboards,
     create_or_update_dashboard,
+    invalidate_category,
     API_KEY,
     load_mappings,
     save_mapping,
 )
+import dashboard_client
+import pytest
 import requests
-import io
-import contextlib
 
 
-def test_create_dashboard():
-    """Test creating a dashboard"""
+def _mock_response(status_code=200, payload=None, error=None):
+    """API response stand-in; raise_for_status raises ``error`` when one is given"""
+
+    def raise_for_status():
+        if error is not None:
+            raise error
+
+    return SimpleNamespace(status_code=status_code, json=lambda: payload, raise_for_status=raise_for_status)
+
+
+def _stub_update_round_trip(session, category_uuid=None):
+    """Answer the category GET with ``category_uuid`` (none when omitted) and accept the PUT"""
+    session.get.return_value = _mock_response(200, {"categoryUuid": category_uuid} if category_uuid else {})
+    session.put.return_value = _mock_response(200)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Replace the client's shared HTTP session and category cache for one test"""
+    fake_session = mock.MagicMock(spec=requests.Session)
+    monkeypatch.setattr(dashboard_client, "_SESSION", fake_session)
+    monkeypatch.setattr(dashboard_client, "_CATEGORY_CACHE", {})
+    return fake_session
+
+
+CREATE_DASHBOARD_CASES = [
     # Expected use - successful creation with default category
-    with mock.patch("requests.post") as mock_post:
-        mock_response = mock.Mock()
-        mock_response.status_code = 201
-        mock_response.json.return_value = {"uuid": "new-uuid-123"}
-        mock_response.raise_for_status = mock.Mock()
-        mock_post.return_value = mock_response
-
-        dashboard_data = {"configs": [], "layouts": [], "meta": {"name": "Test"}}
+    ({"configs": [], "layouts": [], "meta": {"name": "Test"}}, False, None),
+    # Edge case - dashboard data already wrapped with categoryUuid
+    ({"categoryUuid": "Custom Category", "data": {"configs": []}}, False, "Custom Category"),
+    # Edge case - create from file
+    ({"configs": [], "meta": {"name": "From File"}}, True, None),
+]
+
+
+@pytest.mark.parametrize("dashboard_data,from_file,wrapped_category", CREATE_DASHBOARD_CASES)
+def test_create_dashboard(tmp_path, session, dashboard_data, from_file, wrapped_category):
+    """Test creating a dashboard"""
+    session.post.return_value = _mock_response(201, {"uuid": "new-uuid-123"})
+
+    if from_file:
+        temp_path = tmp_path / "create.json"
+        temp_path.write_text(json.dumps(dashboard_data))
+        response = create_dashboard(str(temp_path))
+    else:
         response = create_dashboard(dashboard_data)
 
-        # Verify API was called correctly
-        mock_post.assert_called_once()
-        call_args = mock_post.call_args
-        assert call_args[0][0] == "https://api.glassnode.com/v1/dashboards/create"
-        assert call_args[1]["json"]["data"] == dashboard_data
+    # Verify API was called correctly
+    session.post.assert_called_once()
+    call_args = session.post.call_args
+    assert call_args[0][0] == "https://api.glassnode.com/v1/dashboards/create"
+    assert call_args[1]["params"]["api_key"] == API_KEY
+    if wrapped_category is None:
         # Should use DEFAULT_CATEGORY from dashboard_client
-        import dashboard_client
+        expected = {"categoryUuid": dashboard_client.DEFAULT_CATEGORY, "data": dashboard_data}
+    else:
+        # Should not double-wrap
+        expected = dashboard_data
+    assert json.loads(call_args[1]["data"]) == expected
+    assert response.json()["uuid"] == "new-uuid-123"
 
-        assert call_args[1]["json"]["categoryUuid"] == dashboard_client.DEFAULT_CATEGORY
-        assert response.json()["uuid"] == "new-uuid-123"
 
-    # Edge case - dashboard data already wrapped with categoryUuid
-    with mock.patch("requests.post") as mock_post:
-        mock_response = mock.Mock()
-        mock_response.raise_for_status = mock.Mock()
-        mock_post.return_value = mock_response
+def test_create_dashboard_api_error(session):
+    """Test that a rejected create raises"""
+    session.post.return_value = _mock_response(error=requests.HTTPError("400 Bad Request"))
 
-        wrapped_data = {"categoryUuid": "Custom Category", "data": {"configs": []}}
-        create_dashboard(wrapped_data)
+    with pytest.raises(requests.HTTPError):
+        create_dashboard({})
 
-        # Should not double-wrap
-        call_json = mock_post.call_args[1]["json"]
-        assert call_json["categoryUuid"] == "Custom Category"
-        assert "data" in call_json
 
-    # Edge case - create from file
-    with mock.patch("requests.post") as mock_post:
-        mock_response = mock.Mock()
-        mock_response.raise_for_status = mock.Mock()
-        mock_post.return_value = mock_response
-
-        test_data = {"configs": [], "meta": {"name": "From File"}}
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(test_data, f)
-            temp_path = f.name
-
-        try:
-            create_dashboard(temp_path)
-            call_json = mock_post.call_args[1]["json"]
-            assert call_json["data"]["meta"]["name"] == "From File"
-        finally:
-            os.unlink(temp_path)
-
-    # Failing case - API error
-    with mock.patch("requests.post") as mock_post:
-        mock_response = mock.Mock()
-        mock_response.raise_for_status.side_effect = requests.HTTPError("400 Bad Request")
-        mock_post.return_value = mock_response
-
-        try:
-            create_dashboard({})
-            assert False, "Should have raised HTTPError"
-        except requests.HTTPError:
-            pass
-
-
-def test_update_dashboard():
-    """Test updating a dashboard"""
-    # Expected use - successful update
-    with (
-        mock.patch("requests.get") as mock_get,
-        mock.patch("requests.put") as mock_put,
-    ):
-        # Mock GET response
-        mock_get_resp = mock.Mock()
-        mock_get_resp.json.return_value = {"categoryUuid": "existing-category"}
-        mock_get_resp.raise_for_status = mock.Mock()
-        mock_get.return_value = mock_get_resp
+UPDATE_CATEGORY_CASES = [
+    # Expected use - category fetched from the existing dashboard
+    ("existing-category", None, "existing-category"),
+    # Expected use - explicit category skips the GET
+    ("ignored-category", "known-category", "known-category"),
+    # Edge case - dashboard has no categoryUuid (uses default)
+    (None, None, None),
+]
+
 
-        # Mock PUT response
-        mock_put_resp = mock.Mock()
-        mock_put_resp.status_code = 200
-        mock_put_resp.raise_for_status = mock.Mock()
-        mock_put.return_value = mock_put_resp
+@pytest.mark.parametrize("current_category,explicit_category,expected_category", UPDATE_CATEGORY_CASES)
+def test_update_dashboard(session, current_category, explicit_category, expected_category):
+    """Test updating a dashboard"""
+    _stub_update_round_trip(session, current_category)
 
-        dashboard_data = {"configs": [], "layouts": []}
-        update_dashboard("test-uuid", dashboard_data)
+    dashboard_data = {"configs": [], "layouts": []}
+    update_dashboard("test-uuid", dashboard_data, category_uuid=explicit_category)
 
+    if explicit_category is None:
         # Verify GET was called to fetch category
-        assert "test-uuid" in mock_get.call_args[0][0]
+        assert "test-uuid" in session.get.call_args[0][0]
+        assert session.get.call_args[1]["params"]["api_key"] == API_KEY
+    else:
+        session.get.assert_not_called()
+
+    # Verify PUT was called with wrapped data; DEFAULT_CATEGORY from dashboard_client when none is known
+    put_json = json.loads(session.put.call_args[1]["data"])
+    assert put_json["categoryUuid"] == (expected_category or dashboard_client.DEFAULT_CATEGORY)
+    assert put_json["data"] == dashboard_data
+    assert session.put.call_args[1]["params"]["api_key"] == API_KEY
 
-        # Verify PUT was called with wrapped data
-        put_json = mock_put.call_args[1]["json"]
-        assert put_json["categoryUuid"] == "existing-category"
-        assert put_json["data"] == dashboard_data
 
+def test_update_dashboard_category_cache(tmp_path, session):
+    """Test that the fetched category is reused until an update fails"""
     # Edge case - update from file path
-    with (
-        mock.patch("requests.get") as mock_get,
-        mock.patch("requests.put") as mock_put,
-    ):
-        mock_get_resp = mock.Mock()
-        mock_get_resp.json.return_value = {"categoryUuid": "cat-123"}
-        mock_get_resp.raise_for_status = mock.Mock()
-        mock_get.return_value = mock_get_resp
-
-        mock_put_resp = mock.Mock()
-        mock_put_resp.raise_for_status = mock.Mock()
-        mock_put.return_value = mock_put_resp
-
-        test_data = {"configs": [], "meta": {"name": "Update File"}}
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(test_data, f)
-            temp_path = f.name
-
-        try:
-            update_dashboard("uuid-123", temp_path)
-            put_json = mock_put.call_args[1]["json"]
-            assert put_json["data"]["meta"]["name"] == "Update File"
-        finally:
-            os.unlink(temp_path)
+    _stub_update_round_trip(session, "cat-123")
 
-    # Edge case - dashboard has no categoryUuid (uses default)
-    with (
-        mock.patch("requests.get") as mock_get,
-        mock.patch("requests.put") as mock_put,
-    ):
-        mock_get_resp = mock.Mock()
-        mock_get_resp.json.return_value = {}  # No categoryUuid
-        mock_get_resp.raise_for_status = mock.Mock()
-        mock_get.return_value = mock_get_resp
+    test_data = {"configs": [], "meta": {"name": "Update File"}}
+    temp_path = tmp_path / "update.json"
+    temp_path.write_text(json.dumps(test_data))
+
+    update_dashboard("uuid-123", str(temp_path))
+    put_json = json.loads(session.put.call_args[1]["data"])
+    assert put_json["data"]["meta"]["name"] == "Update File"
 
-        mock_put_resp = mock.Mock()
-        mock_put_resp.raise_for_status = mock.Mock()
-        mock_put.return_value = mock_put_resp
+    # Expected use - repeat update reuses the cached category without another GET
+    update_dashboard("uuid-123", {})
+    assert session.get.call_count == 1
+    assert json.loads(session.put.call_args[1]["data"])["categoryUuid"] == "cat-123"
+    assert session.put.call_count == 2
 
+    # Edge case - a failed PUT drops the cached category
+    session.reset_mock(return_value=True, side_effect=True)
+    session.put.return_value = _mock_response(error=requests.HTTPError(response=_mock_response(500)))
+
+    with pytest.raises(requests.HTTPError):
         update_dashboard("uuid-123", {})
-        put_json = mock_put.call_args[1]["json"]
-        # Should use DEFAULT_CATEGORY from dashboard_client
-        import dashboard_client
 
-        assert put_json["categoryUuid"] == dashboard_client.DEFAULT_CATEGORY
+    session.get.assert_not_called()
+    assert "uuid-123" not in dashboard_client._CATEGORY_CACHE
+
+    # Edge case - an explicit category is only cached once the PUT succeeds
+    session.reset_mock(return_value=True, side_effect=True)
+    session.put.side_effect = requests.ConnectionError("connection reset")
+
+    with pytest.raises(requests.ConnectionError):
+        update_dashboard("uuid-456", {}, category_uuid="unverified-category")
+
+    assert "uuid-456" not in dashboard_client._CATEGORY_CACHE
+
+    session.put.side_effect = None
+    session.put.return_value = _mock_response(200)
+    update_dashboard("uuid-456", {}, category_uuid="verified-category")
+    assert dashboard_client._CATEGORY_CACHE["uuid-456"] == "verified-category"
 
+
+def test_update_dashboard_not_found(session):
+    """Test that a missing dashboard is created instead of updated"""
     # Failing case - dashboard not found (404) - should create new
-    with (
-        mock.patch("dashboard_client.requests.get") as mock_get,
-        mock.patch("dashboard_client.create_dashboard") as mock_create,
-    ):
-        mock_get_resp = mock.Mock()
-        mock_get_resp.raise_for_status.side_effect = requests.HTTPError(response=mock.Mock(status_code=404))
-        mock_get.return_value = mock_get_resp
+    session.get.return_value = _mock_response(error=requests.HTTPError(response=_mock_response(404)))
 
-        mock_create.return_value = mock.Mock(status_code=201, json=lambda: {"uuid": "new-uuid"})
+    with mock.patch("dashboard_client.create_dashboard") as mock_create:
+        mock_create.return_value = _mock_response(201, {"uuid": "new-uuid"})
 
         response = update_dashboard("nonexistent-uuid", {"test": "data"})
 
@@ -190,50 +183,11 @@ def test_update_dashboard():
         assert response.status_code == 201
 
     # Other HTTP errors should still raise
-    with mock.patch("dashboard_client.requests.get") as mock_get:
-        mock_get_resp = mock.Mock()
-        mock_get_resp.raise_for_status.side_effect = requests.HTTPError(response=mock.Mock(status_code=500))
-        mock_get.return_value = mock_get_resp
-
-        try:
-            update_dashboard("error-uuid", {})
-            assert False, "Should have raised HTTPError"
-        except requests.HTTPError:
-            pass
-
-
-def test_api_key_handling():
-    """Test API key is included in requests"""
-    # Test create includes API key
-    with mock.patch("requests.post") as mock_post:
-        mock_response = mock.Mock()
-        mock_response.raise_for_status = mock.Mock()
-        mock_post.return_value = mock_response
-
-        create_dashboard({})
-
-        params = mock_post.call_args[1]["params"]
-        assert params["api_key"] == API_KEY
-
-    # Test update includes API key
-    with (
-        mock.patch("requests.get") as mock_get,
-        mock.patch("requests.put") as mock_put,
-    ):
-        mock_get_resp = mock.Mock()
-        mock_get_resp.json.return_value = {"categoryUuid": "cat"}
-        mock_get_resp.raise_for_status = mock.Mock()
-        mock_get.return_value = mock_get_resp
-
-        mock_put_resp = mock.Mock()
-        mock_put_resp.raise_for_status = mock.Mock()
-        mock_put.return_value = mock_put_resp
-
-        update_dashboard("uuid", {})
+    session.reset_mock(return_value=True, side_effect=True)
+    session.get.return_value = _mock_response(error=requests.HTTPError(response=_mock_response(500)))
 
-        # Check both GET and PUT have API key
-        assert mock_get.call_args[1]["params"]["api_key"] == API_KEY
-        assert mock_put.call_args[1]["params"]["api_key"] == API_KEY
+    with pytest.raises(requests.HTTPError):
+        update_dashboard("error-uuid", {})
 
 
 def test_create_or_update_dashboard():
@@ -244,7 +198,7 @@ def test_create_or_update_dashboard():
         mock.patch("dashboard_client.update_dashboard") as mock_update,
         mock.patch("dashboard_client.load_mappings", return_value={}),
     ):
-        mock_create.return_value = mock.Mock(status_code=201, json=lambda: {"uuid": "new-uuid"})
+        mock_create.return_value = _mock_response(201, {"uuid": "new-uuid"})
 
         response = create_or_update_dashboard("dashboards/test_dashboard.json")
 
@@ -258,7 +212,7 @@ def test_create_or_update_dashboard():
         mock.patch("dashboard_client.update_dashboard") as mock_update,
         mock.patch("dashboard_client.load_mappings", return_value={"configs/test.json": "existing-uuid"}),
     ):
-        mock_update.return_value = mock.Mock(status_code=200, json=lambda: {"uuid": "existing-uuid"})
+        mock_update.return_value = _mock_response(200, {"uuid": "existing-uuid"})
 
         response = create_or_update_dashboard("dashboards/test_dashboard.json")
 
@@ -266,109 +220,89 @@ def test_create_or_update_dashboard():
         mock_update.assert_called_once_with("existing-uuid", Path("dashboards/test_dashboard.json"))
         mock_create.assert_not_called()
 
+    # Edge case - the create category is not applied to an existing dashboard
+    with (
+        mock.patch("dashboard_client.update_dashboard") as mock_update,
+        mock.patch("dashboard_client.load_mappings", return_value={"configs/test.json": "existing-uuid"}),
+    ):
+        create_or_update_dashboard("dashboards/test_dashboard.json", category_uuid="new-category")
 
-def test_create_dashboards():
-    """Test creating multiple dashboards"""
-    # Suppress print statements during test
-    f = io.StringIO()
+        mock_update.assert_called_once_with("existing-uuid", Path("dashboards/test_dashboard.json"))
 
-    # Expected use - successful batch creation from list
+    # Edge case - only the trailing "_dashboard" is stripped when looking up the config path
     with (
         mock.patch("dashboard_client.create_dashboard") as mock_create,
-        mock.patch("dashboard_client.load_mappings", return_value={}),  # No existing dashboards
+        mock.patch("dashboard_client.update_dashboard") as mock_update,
+        mock.patch("dashboard_client.load_mappings", return_value={"configs/my_dashboard_stats.json": "stats-uuid"}),
     ):
-        # Mock successful responses
-        mock_create.side_effect = [
-            mock.Mock(status_code=200, json=lambda: {"uuid": "uuid-1"}),
-            mock.Mock(status_code=200, json=lambda: {"uuid": "uuid-2"}),
-            mock.Mock(status_code=200, json=lambda: {"uuid": "uuid-3"}),
-        ]
+        create_or_update_dashboard("dashboards/my_dashboard_stats_dashboard.json")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Create test files
-            (temp_path / "dash1.json").write_text('{"name": "Dashboard 1"}')
-            (temp_path / "dash2.json").write_text('{"name": "Dashboard 2"}')
-            (temp_path / "dash3.json").write_text('{"name": "Dashboard 3"}')
+        mock_update.assert_called_once_with("stats-uuid", Path("dashboards/my_dashboard_stats_dashboard.json"))
+        mock_create.assert_not_called()
 
-            file_list = list(temp_path.glob("*.json"))
 
-            with contextlib.redirect_stdout(f):
-                responses = create_dashboards(file_list)
+@pytest.fixture(scope="module")
+def dash_dir(tmp_path_factory):
+    """Directory of three dashboard files shared by the batch creation cases"""
+    directory = tmp_path_factory.mktemp("dashes")
+    for n in (1, 2, 3):
+        (directory / f"dash{n}.json").write_text(f'{{"name": "Dashboard {n}"}}')
+    return directory
 
-            assert len(responses) == 3
-            assert all(r.status_code == 200 for r in responses.values())
-            assert mock_create.call_count == 3
 
+CREATE_DASHBOARDS_CASES = [
+    # Expected use - successful batch creation from list
+    ("create_dashboard", True, [200, 200, 200], [200, 200, 200]),
     # Expected use - from directory
-    with (
-        mock.patch("dashboard_client.create_dashboard") as mock_create,
-        mock.patch("dashboard_client.load_mappings", return_value={}),
-    ):
-        mock_create.return_value = mock.Mock(status_code=201, json=lambda: {"uuid": "new-uuid"})
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            (temp_path / "dash1.json").write_text('{"name": "Dashboard 1"}')
-            (temp_path / "dash2.json").write_text('{"name": "Dashboard 2"}')
+    ("create_dashboard", False, [201, 201, 201], [201, 201, 201]),
+    # Expected use - from directory through create_or_update_dashboard
+    ("create_or_update_dashboard", False, [201, 200, 201], [200, 201, 201]),
+    # Edge case - mix of successful and failed creations
+    ("create_dashboard", False, [201, Exception("API Error"), 201], [201, 201, 500]),
+]
 
-            with contextlib.redirect_stdout(f):
-                responses = create_dashboards(temp_dir)
 
-            assert len(responses) == 2
-            assert mock_create.call_count == 2
+@pytest.mark.parametrize("target,as_list,results,expected_statuses", CREATE_DASHBOARDS_CASES)
+def test_create_dashboards_batch(dash_dir, target, as_list, results, expected_statuses):
+    """Test creating every dashboard in a list of files or a directory"""
+    source = sorted(dash_dir.glob("*.json")) if as_list else str(dash_dir)
 
-    # Edge case - single file path (not a list or directory)
     with (
-        mock.patch("dashboard_client.create_dashboard") as mock_create,
-        mock.patch("dashboard_client.load_mappings", return_value={}),
+        mock.patch(f"dashboard_client.{target}") as mock_create,
+        mock.patch("dashboard_client.load_mappings", return_value={}),  # No existing dashboards
     ):
-        mock_create.return_value = mock.Mock(status_code=201)
+        mock_create.side_effect = [r if isinstance(r, Exception) else _mock_response(r) for r in results]
 
-        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
-            f.write(b'{"name": "Single"}')
-            temp_file = f.name
+        responses = create_dashboards(source)
 
-        try:
-            responses = create_dashboards(temp_file)
-            assert len(responses) == 1
-            assert Path(temp_file) in responses
-        finally:
-            os.unlink(temp_file)
+        # Uploads run concurrently, so only the multiset of outcomes is deterministic
+        assert len(responses) == 3
+        assert sorted(r.status_code for r in responses.values()) == expected_statuses
+        assert mock_create.call_count == 3
 
-    # Edge case - mix of successful and failed creations
+
+def test_create_dashboards(tmp_path):
+    """Test creating multiple dashboards"""
+    # Edge case - single file path (not a list or directory)
     with (
         mock.patch("dashboard_client.create_dashboard") as mock_create,
         mock.patch("dashboard_client.load_mappings", return_value={}),
     ):
-        # First succeeds, second fails, third succeeds
-        mock_create.side_effect = [mock.Mock(status_code=201), Exception("API Error"), mock.Mock(status_code=201)]
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            (temp_path / "good1.json").write_text('{"name": "Good 1"}')
-            (temp_path / "bad.json").write_text('{"name": "Bad"}')
-            (temp_path / "good2.json").write_text('{"name": "Good 2"}')
-
-            responses = create_dashboards(temp_dir)
+        mock_create.return_value = _mock_response(201)
 
-            assert len(responses) == 3
+        temp_file = tmp_path / "single.json"
+        temp_file.write_bytes(b'{"name": "Single"}')
 
-            # Check that we have 2 successes and 1 failure
-            success_count = sum(1 for r in responses.values() if r.status_code == 201)
-            error_count = sum(1 for r in responses.values() if r.status_code == 500)
-
-            assert success_count == 2
-            assert error_count == 1
+        responses = create_dashboards(str(temp_file))
+        assert len(responses) == 1
+        assert temp_file in responses
 
     # Failing case - empty directory
+    empty_dir = tmp_path / "empty"
+    empty_dir.mkdir()
     with mock.patch("dashboard_client.load_mappings", return_value={}):
-        with tempfile.TemporaryDirectory() as temp_dir:
-            responses = create_dashboards(temp_dir)
-            assert len(responses) == 0  # Empty dict, not an error
+        responses = create_dashboards(str(empty_dir))
+        assert len(responses) == 0  # Empty dict, not an error
 
     # Edge case - directory doesn't exist but treated as file path
     # When a non-existent path is provided, it's treated as a single file
@@ -378,31 +312,12 @@ def test_create_dashboards():
         assert Path("/nonexistent/directory") in responses
         assert responses[Path("/nonexistent/directory")].status_code == 500
 
-    # Test with create_or_update_dashboard mock
-    with mock.patch("dashboard_client.create_or_update_dashboard") as mock_create_or_update:
-        mock_create_or_update.side_effect = [
-            mock.Mock(status_code=201, json=lambda: {"uuid": "uuid-1"}),
-            mock.Mock(status_code=200, json=lambda: {"uuid": "uuid-2"}),
-        ]
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Create test dashboard files
-            (temp_path / "dash1.json").write_text('{"name": "Dashboard 1"}')
-            (temp_path / "dash2.json").write_text('{"name": "Dashboard 2"}')
-
-            responses = create_dashboards(temp_dir)
-
-            assert len(responses) == 2
-            assert mock_create_or_update.call_count == 2
-
-
-def test_update_dashboards():
+def test_update_dashboards(tmp_path, monkeypatch):
     """Test updating multiple dashboards"""
     # Expected use - from dict mapping
     with mock.patch("dashboard_client.update_dashboard") as mock_update:
-        mock_update.side_effect = [mock.Mock(status_code=200), mock.Mock(status_code=200)]
+        mock_update.side_effect = [_mock_response(200), _mock_response(200)]
 
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
@@ -422,25 +337,32 @@ def test_update_dashboards():
 
     # Expected use - from list of tuples
     with mock.patch("dashboard_client.update_dashboard") as mock_update:
-        mock_update.return_value = mock.Mock(status_code=200)
+        mock_update.return_value = _mock_response(200)
 
-        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
-            f.write(b'{"name": "Test"}')
-            temp_file = f.name
+        temp_file = tmp_path / "test.json"
+        temp_file.write_bytes(b'{"name": "Test"}')
 
-        try:
-            mapping = [("uuid-1", temp_file), ("uuid-2", temp_file)]
-            responses = update_dashboards(mapping)
+        mapping = [("uuid-1", str(temp_file)), ("uuid-2", str(temp_file))]
+        responses = update_dashboards(mapping)
 
-            assert len(responses) == 2
-            assert "uuid-1" in responses
-            assert "uuid-2" in responses
-        finally:
-            os.unlink(temp_file)
+        assert len(responses) == 2
+        assert "uuid-1" in responses
+        assert "uuid-2" in responses
+
+    # Expected use - a known category is passed on to every update
+    with mock.patch("dashboard_client.update_dashboard") as mock_update:
+        mock_update.return_value = _mock_response(200)
+
+        update_dashboards([("uuid-1", "dash1.json"), ("uuid-2", "dash2.json")], category_uuid="known-category")
+
+        assert sorted(mock_update.call_args_list) == [
+            mock.call("uuid-1", Path("dash1.json"), "known-category"),
+            mock.call("uuid-2", Path("dash2.json"), "known-category"),
+        ]
 
     # Expected use - from directory with mappings
     with mock.patch("dashboard_client.update_dashboard") as mock_update:
-        mock_update.return_value = mock.Mock(status_code=200)
+        mock_update.return_value = _mock_response(200)
 
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
@@ -458,7 +380,7 @@ def test_update_dashboards():
             configs_dir = temp_path / "configs" / "examples"
             configs_dir.mkdir(parents=True)
 
-            # Create mappings file with paths relative to temp_dir
+            # Create mappings file with absolute paths inside temp_dir
             mappings = {
                 str(configs_dir / "test1.json"): "uuid-1",
                 str(configs_dir / "test2.json"): "uuid-2",
@@ -468,28 +390,35 @@ def test_update_dashboards():
             mappings_file = temp_path / ".dashboard_mappings.json"
             mappings_file.write_text(json.dumps(mappings))
 
-            # Change to temp directory for the test
-            original_cwd = os.getcwd()
-            os.chdir(temp_path)
+            # Mapped paths are absolute, so only the mappings file location needs redirecting
+            with mock.patch.object(dashboard_client, "MAPPINGS_FILE", str(mappings_file)):
+                responses = update_dashboards(dashboards_dir)
+
+            assert len(responses) == 2  # Only files in examples directory
+            assert "uuid-1" in responses
+            assert "uuid-2" in responses
+            assert "uuid-3" not in responses  # Different directory
+
+    # Edge case - relative mapping paths match an absolute directory argument
+    with mock.patch("dashboard_client.update_dashboard") as mock_update:
+        mock_update.return_value = _mock_response(200)
 
-            try:
-                # Mock Path.exists to return True for our test files
-                with mock.patch("pathlib.Path.exists") as mock_exists:
-                    # The mock needs to handle being called as a method
-                    mock_exists.return_value = True
+        # Relative mappings resolve against the working directory, restored by monkeypatch afterwards
+        relative_root = tmp_path / "relative"
+        dashboards_dir = relative_root / "dashboards" / "examples"
+        dashboards_dir.mkdir(parents=True)
+        (dashboards_dir / "test1_dashboard.json").write_text('{"name": "Test 1"}')
 
-                    responses = update_dashboards(dashboards_dir)
+        mappings = {"configs/examples/test1.json": "uuid-1", "configs/examples/stale.json": "uuid-2"}
+        (relative_root / ".dashboard_mappings.json").write_text(json.dumps(mappings))
 
-                    assert len(responses) == 2  # Only files in examples directory
-                    assert "uuid-1" in responses
-                    assert "uuid-2" in responses
-                    assert "uuid-3" not in responses  # Different directory
-            finally:
-                os.chdir(original_cwd)
+        monkeypatch.chdir(relative_root)
+        responses = update_dashboards(dashboards_dir)
+        assert list(responses) == ["uuid-1"]
 
     # Edge case - some updates succeed, some fail
     with mock.patch("dashboard_client.update_dashboard") as mock_update:
-        mock_update.side_effect = [mock.Mock(status_code=200), Exception("Network error"), mock.Mock(status_code=200)]
+        mock_update.side_effect = [_mock_response(200), Exception("Network error"), _mock_response(200)]
 
         mapping = {"uuid-1": "file1.json", "uuid-2": "file2.json", "uuid-3": "file3.json"}
 
@@ -503,161 +432,101 @@ def test_update_dashboards():
         assert error_count == 1
 
     # Failing case - directory with no mappings file
-    with tempfile.TemporaryDirectory() as temp_dir:
-        try:
-            update_dashboards(temp_dir)
-            assert False, "Should raise ValueError for missing mappings"
-        except ValueError as e:
-            # The error message depends on whether file exists but is empty vs doesn't exist
-            assert "No" in str(e) and "found" in str(e)
+    monkeypatch.setattr(dashboard_client, "MAPPINGS_FILE", str(tmp_path / "missing.json"))
+    with pytest.raises(ValueError, match="No .dashboard_mappings.json file found"):
+        update_dashboards(tmp_path)
 
     # Failing case - directory with no matching dashboards
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-
-        # Create mappings file with non-matching paths
-        mappings = {"configs/other/test.json": "uuid-1"}
-        (temp_path / ".dashboard_mappings.json").write_text(json.dumps(mappings))
-
-        # Create dashboard directory but no matching files
-        (temp_path / "dashboards" / "examples").mkdir(parents=True)
+    unmatched_root = tmp_path / "unmatched"
+    unmatched_dir = unmatched_root / "dashboards" / "examples"
+    unmatched_dir.mkdir(parents=True)
 
-        original_cwd = os.getcwd()
-        os.chdir(temp_path)
+    # Create mappings file with non-matching paths
+    mappings_file = unmatched_root / ".dashboard_mappings.json"
+    mappings_file.write_text(json.dumps({"configs/other/test.json": "uuid-1"}))
+    monkeypatch.setattr(dashboard_client, "MAPPINGS_FILE", str(mappings_file))
 
-        try:
-            update_dashboards("dashboards/examples")
-            assert False, "Should raise ValueError for no matching dashboards"
-        except ValueError as e:
-            assert "No mapped dashboards found" in str(e)
-        finally:
-            os.chdir(original_cwd)
+    with pytest.raises(ValueError, match="No mapped dashboards found"):
+        update_dashboards(unmatched_dir)
 
 
-def test_category_uuid_env_var():
+def test_category_uuid_env_var(session):
     """Test GLASSNODE_CATEGORY_UUID environment variable handling"""
-    import dashboard_client
+    # Test when env var is not set (default behavior); the module settings are restored on exit
+    with mock.patch.multiple(dashboard_client, CATEGORY_UUID=None, DEFAULT_CATEGORY="My Dashboards"):
+        session.post.return_value = _mock_response(201)
 
-    # Save original values
-    original_category_uuid = dashboard_client.CATEGORY_UUID
-    original_default_category = dashboard_client.DEFAULT_CATEGORY
+        create_dashboard({"test": "data"})
 
-    try:
-        # Test when env var is not set (default behavior)
-        dashboard_client.CATEGORY_UUID = None
-        dashboard_client.DEFAULT_CATEGORY = "My Dashboards"
-
-        with mock.patch("requests.post") as mock_post:
-            mock_response = mock.Mock()
-            mock_response.status_code = 201
-            mock_response.raise_for_status = mock.Mock()
-            mock_post.return_value = mock_response
-
-            create_dashboard({"test": "data"})
-
-            call_json = mock_post.call_args[1]["json"]
-            assert call_json["categoryUuid"] == "My Dashboards"
+        call_json = json.loads(session.post.call_args[1]["data"])
+        assert call_json["categoryUuid"] == "My Dashboards"
 
         # Test when env var is set
         test_category_uuid = "test-category-uuid-123"
         dashboard_client.CATEGORY_UUID = test_category_uuid
         dashboard_client.DEFAULT_CATEGORY = test_category_uuid
 
-        with mock.patch("requests.post") as mock_post:
-            mock_response = mock.Mock()
-            mock_response.status_code = 201
-            mock_response.raise_for_status = mock.Mock()
-            mock_post.return_value = mock_response
+        session.reset_mock(return_value=True, side_effect=True)
+        session.post.return_value = _mock_response(201)
 
-            create_dashboard({"test": "data"})
+        create_dashboard({"test": "data"})
 
-            call_json = mock_post.call_args[1]["json"]
-            assert call_json["categoryUuid"] == test_category_uuid
+        call_json = json.loads(session.post.call_args[1]["data"])
+        assert call_json["categoryUuid"] == test_category_uuid
 
         # Test explicit category_uuid parameter overrides env var
-        with mock.patch("requests.post") as mock_post:
-            mock_response = mock.Mock()
-            mock_response.status_code = 201
-            mock_response.raise_for_status = mock.Mock()
-            mock_post.return_value = mock_response
+        session.reset_mock(return_value=True, side_effect=True)
+        session.post.return_value = _mock_response(201)
 
-            create_dashboard({"test": "data"}, category_uuid="explicit-category")
+        create_dashboard({"test": "data"}, category_uuid="explicit-category")
 
-            call_json = mock_post.call_args[1]["json"]
-            assert call_json["categoryUuid"] == "explicit-category"
+        call_json = json.loads(session.post.call_args[1]["data"])
+        assert call_json["categoryUuid"] == "explicit-category"
 
         # Test update dashboard uses DEFAULT_CATEGORY when dashboard has no category
-        with (
-            mock.patch("requests.get") as mock_get,
-            mock.patch("requests.put") as mock_put,
-        ):
-            mock_get_resp = mock.Mock()
-            mock_get_resp.json.return_value = {}  # No categoryUuid
-            mock_get_resp.raise_for_status = mock.Mock()
-            mock_get.return_value = mock_get_resp
-
-            mock_put_resp = mock.Mock()
-            mock_put_resp.raise_for_status = mock.Mock()
-            mock_put.return_value = mock_put_resp
-
-            update_dashboard("uuid-123", {})
-            put_json = mock_put.call_args[1]["json"]
-            assert put_json["categoryUuid"] == test_category_uuid
-
-    finally:
-        # Restore original values
-        dashboard_client.CATEGORY_UUID = original_category_uuid
-        dashboard_client.DEFAULT_CATEGORY = original_default_category
-
-
-def test_mappings():
-    """Test UUID mapping functions"""
-    import dashboard_client
+        session.reset_mock(return_value=True, side_effect=True)
+        _stub_update_round_trip(session)  # No categoryUuid
+
+        invalidate_category("uuid-123")
+        update_dashboard("uuid-123", {})
+        put_json = json.loads(session.put.call_args[1]["data"])
+        assert put_json["categoryUuid"] == test_category_uuid
 
-    # Save original MAPPINGS_FILE value
-    original_mappings_file = dashboard_client.MAPPINGS_FILE
 
+def test_mappings(tmp_path, monkeypatch):
+    """Test UUID mapping functions"""
     # Expected use - save and load mappings
-    temp_path = tempfile.mktemp(suffix=".json")
-
-    try:
-        dashboard_client.MAPPINGS_FILE = temp_path
-
-        # Test loading empty file
-        mappings = load_mappings()
-        assert mappings == {}
-
-        # Test saving mapping
-        save_mapping("configs/test.json", "uuid-123")
-
-        # Test loading saved mapping
-        mappings = load_mappings()
-        assert mappings["configs/test.json"] == "uuid-123"
-
-        # Test updating existing mapping
-        save_mapping("configs/test.json", "new-uuid")
-        mappings = load_mappings()
-        assert mappings["configs/test.json"] == "new-uuid"
-
-        # Test adding another mapping
-        save_mapping("configs/other.json", "uuid-456")
-        mappings = load_mappings()
-        assert len(mappings) == 2
-        assert mappings["configs/test.json"] == "new-uuid"
-        assert mappings["configs/other.json"] == "uuid-456"
-
-    finally:
-        os.unlink(temp_path)
-        dashboard_client.MAPPINGS_FILE = original_mappings_file
-
-
-if __name__ == "__main__":
-    test_create_dashboard()
-    test_update_dashboard()
-    test_api_key_handling()
-    test_category_uuid_env_var()
-    test_create_dashboards()
-    test_update_dashboards()
-    test_mappings()
-    test_create_or_update_dashboard()
-    print("All dashboard_client tests passed!")
+    temp_path = str(tmp_path / "mappings.json")
+    monkeypatch.setattr(dashboard_client, "MAPPINGS_FILE", temp_path)
+
+    # Edge case - no mappings file yet
+    assert load_mappings() == {}
+
+    # Test saving mapping
+    save_mapping("configs/test.json", "uuid-123")
+    assert load_mappings() == {"configs/test.json": "uuid-123"}
+
+    # Test updating an existing mapping, then adding another one
+    save_mapping("configs/test.json", "new-uuid")
+    save_mapping("configs/other.json", "uuid-456")
+    mappings = load_mappings()
+    assert mappings == {"configs/test.json": "new-uuid", "configs/other.json": "uuid-456"}
+    assert json.loads(Path(temp_path).read_text()) == mappings
+
+    # Edge case - modifying the returned dict doesn't leak into later loads
+    mappings["configs/scratch.json"] = "scratch"
+    assert "configs/scratch.json" not in load_mappings()
+
+    # Edge case - file rewritten outside save_mapping is reloaded
+    with open(temp_path, "w") as f:
+        json.dump({"configs/external.json": "uuid-789"}, f)
+    assert load_mappings() == {"configs/external.json": "uuid-789"}
+
+    # Edge case - empty mappings file
+    Path(temp_path).write_text("{}")
+    assert load_mappings() == {}
+
+    # Failing case - corrupted mappings file
+    Path(temp_path).write_text("{invalid}")
+    with pytest.raises(json.JSONDecodeError):
+        load_mappings()